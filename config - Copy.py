@@ -1,105 +1,202 @@
 """Configuration settings for EchoVerse application."""
 
 import os
-import streamlit as st
-from typing import Dict, List
-from dotenv import load_dotenv
+import sys
+import functools
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Final, List, NamedTuple, Tuple
 
-# Load environment variables from .env file
-load_dotenv()
+
+@functools.lru_cache(maxsize=1)
+def _env():
+    """Parse the .env file once and overlay the process environment on top of it."""
+    from dotenv import dotenv_values
+    return {**dotenv_values(".env"), **os.environ}
+
+
+def _get(key, default=""):
+    """Look up a setting in the parsed environment snapshot."""
+    value = _env().get(key)
+    return default if value is None else value
 
 # Application settings
 APP_TITLE = "EchoVerse"
 APP_SUBTITLE = "An AI-Powered Audiobook Creation Tool"
-MAX_TEXT_LENGTH = 10000
-SUPPORTED_FILE_TYPES = ['.txt']
+MAX_TEXT_LENGTH: Final[int] = 10_000
+SUPPORTED_FILE_TYPES: Final[Tuple[str, ...]] = ('.txt',)
 
 # Tone settings
-AVAILABLE_TONES = {
-    "Neutral": {
-        "description": "Clear, balanced narration suitable for educational content",
-        "color": "#3B82F6",
-        "prompt": "Rewrite the following text in a neutral, clear, and educational tone while maintaining all key information and meaning: "
-    },
-    "Suspenseful": {
-        "description": "Dramatic, engaging style perfect for thrillers and mysteries", 
-        "color": "#8B5CF6",
-        "prompt": "Rewrite the following text with a suspenseful, dramatic tone that builds tension and engages the reader while preserving the original meaning: "
-    },
-    "Inspiring": {
-        "description": "Uplifting, motivational delivery for personal development",
-        "color": "#10B981", 
-        "prompt": "Rewrite the following text with a inspiring, motivational tone that uplifts and encourages while maintaining the original message: "
-    }
-}
+_PROMPT_TMPL = "Rewrite the following text in a {style} tone that {goal} while preserving the original meaning: "
+
+
+class Tone(NamedTuple):
+    """Narration tone shown in the UI and used to prompt the rewriter."""
+    description: str
+    color: str
+    prompt: str
+
+
+def _tone(description: str, color: str, style: str, goal: str) -> Tone:
+    """Build a tone whose prompt shares the common rewrite template."""
+    return Tone(description, color, _PROMPT_TMPL.format_map({"style": style, "goal": goal}))
+
+
+AVAILABLE_TONES = MappingProxyType({
+    "Neutral": _tone(
+        description="Clear, balanced narration suitable for educational content",
+        color="#3B82F6",
+        style="neutral, clear, and educational",
+        goal="keeps all key information intact"
+    ),
+    "Suspenseful": _tone(
+        description="Dramatic, engaging style perfect for thrillers and mysteries",
+        color="#8B5CF6",
+        style="suspenseful, dramatic",
+        goal="builds tension and engages the reader"
+    ),
+    "Inspiring": _tone(
+        description="Uplifting, motivational delivery for personal development",
+        color="#10B981",
+        style="inspiring, motivational",
+        goal="uplifts and encourages the reader"
+    )
+})
 
 # Voice settings
-AVAILABLE_VOICES = {
-    "Lisa": {
-        "description": "Female voice, warm and professional",
-        "voice": "en-US_LisaV3Voice"
-    },
-    "Michael": {
-        "description": "Male voice, clear and authoritative", 
-        "voice": "en-US_MichaelV3Voice"
-    },
-    "Allison": {
-        "description": "Female voice, friendly and engaging",
-        "voice": "en-US_AllisonV3Voice"
-    }
+class Voice(NamedTuple):
+    """Narrator voice and its IBM Watson TTS voice identifier."""
+    description: str
+    voice: str
+
+
+AVAILABLE_VOICES = MappingProxyType({
+    "Lisa": Voice(
+        description="Female voice, warm and professional",
+        voice="en-US_LisaV3Voice"
+    ),
+    "Michael": Voice(
+        description="Male voice, clear and authoritative",
+        voice="en-US_MichaelV3Voice"
+    ),
+    "Allison": Voice(
+        description="Female voice, friendly and engaging",
+        voice="en-US_AllisonV3Voice"
+    )
+})
+
+class _ServiceConfig(NamedTuple):
+    """Resolved credentials and endpoints for the external AI services."""
+    IBM_WATSONX_API_KEY: str
+    IBM_WATSONX_API_URL: str
+    IBM_WATSONX_PROJECT_ID: str
+    IBM_TTS_API_KEY: str
+    IBM_TTS_URL: str
+    HUGGINGFACE_API_KEY: str
+    HUGGINGFACE_API_URL: str
+    AI_SERVICE: str
+
+
+@functools.lru_cache(maxsize=1)
+def _secrets():
+    """Snapshot Streamlit secrets once, or None when they are unavailable."""
+    try:
+        import streamlit as st
+        from streamlit.errors import StreamlitAPIException
+    except ImportError:
+        return None
+
+    try:
+        return dict(st.secrets)
+    except (FileNotFoundError, AttributeError, StreamlitAPIException):
+        return None
+
+
+def _resolve(key, default=""):
+    """Resolve a setting from Streamlit secrets, falling back to the environment."""
+    secrets = _secrets()
+    return (secrets.get(key) if secrets else None) or _get(key, default)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> _ServiceConfig:
+    """Resolve every service setting exactly once."""
+    return _ServiceConfig(
+        # IBM Watson Configuration
+        IBM_WATSONX_API_KEY=_resolve("IBM_WATSONX_API_KEY"),
+        IBM_WATSONX_API_URL=_resolve("IBM_WATSONX_API_URL", "https://us-south.ml.cloud.ibm.com/ml/v1/text/generation"),
+        IBM_WATSONX_PROJECT_ID=_resolve("IBM_WATSONX_PROJECT_ID"),
+        # IBM Watson Text to Speech Configuration
+        IBM_TTS_API_KEY=_resolve("IBM_TTS_API_KEY"),
+        IBM_TTS_URL=_resolve("IBM_TTS_URL", "https://api.us-south.text-to-speech.watson.cloud.ibm.com"),
+        # Hugging Face Configuration
+        HUGGINGFACE_API_KEY=_resolve("HUGGINGFACE_API_KEY"),
+        HUGGINGFACE_API_URL=_resolve("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models"),
+        # AI Service selection
+        AI_SERVICE=_get("AI_SERVICE", "huggingface"),  # huggingface or ibm
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _settings():
+    """Flatten the resolved config and its derived readiness flags into one dict."""
+    cfg = _load_config()
+    settings = cfg._asdict()
+    settings["IBM_WATSONX_READY"] = bool(cfg.IBM_WATSONX_API_KEY and cfg.IBM_WATSONX_PROJECT_ID)
+    settings["IBM_TTS_READY"] = bool(cfg.IBM_TTS_API_KEY)
+    settings["HUGGINGFACE_READY"] = bool(cfg.HUGGINGFACE_API_KEY)
+
+    # Intern endpoint URLs and pre-build per-tone model URLs for the request hot path
+    for key in ("IBM_WATSONX_API_URL", "IBM_TTS_URL", "HUGGINGFACE_API_URL"):
+        settings[key] = sys.intern(settings[key])
+    settings["HUGGINGFACE_MODEL_URLS"] = MappingProxyType({
+        tone: sys.intern(f"{cfg.HUGGINGFACE_API_URL}/{model}")
+        for tone, model in HUGGINGFACE_MODELS.items()
+    })
+    return settings
+
+
+_LAZY_SETTINGS = frozenset(_ServiceConfig._fields) | {
+    "IBM_WATSONX_READY", "IBM_TTS_READY", "HUGGINGFACE_READY", "HUGGINGFACE_MODEL_URLS"
 }
 
-# Try to load from Streamlit secrets, fallback to environment variables
-try:
-    # IBM Watson Configuration
-    IBM_WATSONX_API_KEY = st.secrets.get("IBM_WATSONX_API_KEY", os.getenv("IBM_WATSONX_API_KEY", ""))
-    IBM_WATSONX_API_URL = st.secrets.get("IBM_WATSONX_API_URL", os.getenv("IBM_WATSONX_API_URL", "https://us-south.ml.cloud.ibm.com/ml/v1/text/generation"))
-    IBM_WATSONX_PROJECT_ID = st.secrets.get("IBM_WATSONX_PROJECT_ID", os.getenv("IBM_WATSONX_PROJECT_ID", ""))
-    
-    # IBM Watson Text to Speech Configuration
-    IBM_TTS_API_KEY = st.secrets.get("IBM_TTS_API_KEY", os.getenv("IBM_TTS_API_KEY", ""))
-    IBM_TTS_URL = st.secrets.get("IBM_TTS_URL", os.getenv("IBM_TTS_URL", "https://api.us-south.text-to-speech.watson.cloud.ibm.com"))
-    
-    # Hugging Face Configuration
-    HUGGINGFACE_API_KEY = st.secrets.get("HUGGINGFACE_API_KEY", os.getenv("HUGGINGFACE_API_KEY", ""))
-    HUGGINGFACE_API_URL = st.secrets.get("HUGGINGFACE_API_URL", os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models"))
-except:
-    # Fallback to environment variables only
-    IBM_WATSONX_API_KEY = os.getenv("IBM_WATSONX_API_KEY", "")
-    IBM_WATSONX_API_URL = os.getenv("IBM_WATSONX_API_URL", "https://us-south.ml.cloud.ibm.com/ml/v1/text/generation")
-    IBM_WATSONX_PROJECT_ID = os.getenv("IBM_WATSONX_PROJECT_ID", "")
-    IBM_TTS_API_KEY = os.getenv("IBM_TTS_API_KEY", "")
-    IBM_TTS_URL = os.getenv("IBM_TTS_URL", "https://api.us-south.text-to-speech.watson.cloud.ibm.com")
-    HUGGINGFACE_API_KEY = os.getenv("HUGGINGFACE_API_KEY", "")
-    HUGGINGFACE_API_URL = os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models")
+
+def __getattr__(name):
+    """Resolve service settings on first access so importing config stays cheap."""
+    if name in _LAZY_SETTINGS:
+        settings = _settings()
+        globals().update(settings)
+        return settings[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # File paths
-TEMP_DIR = "temp"
-AUDIO_DIR = os.path.join(TEMP_DIR, "audio")
-ASSETS_DIR = "assets"
+TEMP_DIR = Path("temp")
+AUDIO_DIR = TEMP_DIR / "audio"
+ASSETS_DIR = Path("assets")
 
-# AI Service selection
-AI_SERVICE = os.getenv("AI_SERVICE", "huggingface")  # huggingface or ibm
+for _directory in (TEMP_DIR, AUDIO_DIR, ASSETS_DIR):
+    _directory.mkdir(parents=True, exist_ok=True)
 
 # Hugging Face Models for different tones
-HUGGINGFACE_MODELS = {
+HUGGINGFACE_MODELS = MappingProxyType({
     "Neutral": "microsoft/DialoGPT-medium",
     "Suspenseful": "gpt2",
     "Inspiring": "microsoft/DialoGPT-large",
     "Podcast": "microsoft/DialoGPT-large"  # Added podcast model
-}
+})
 
 # Podcast settings
-PODCAST_SETTINGS = {
-    "intro_music": os.path.join(ASSETS_DIR, "intro_music.mp3"),  # Path to intro music file
-    "outro_music": os.path.join(ASSETS_DIR, "outro_music.mp3"),  # Path to outro music file
+PODCAST_SETTINGS: Final[Dict[str, Any]] = {
+    "intro_music": ASSETS_DIR / "intro_music.mp3",  # Path to intro music file
+    "outro_music": ASSETS_DIR / "outro_music.mp3",  # Path to outro music file
     "chapter_pause_duration": 1.5,  # seconds pause between chapters
     "intro_fade_duration": 3.0,  # seconds for music fade in/out
     "default_host": "EchoVerse AI Narrator"
 }
 
 # Audio enhancement settings
-AUDIO_ENHANCEMENTS = {
+AUDIO_ENHANCEMENTS: Final[Dict[str, Any]] = {
     "noise_reduction": True,
     "volume_normalization": True,
     "eq_preset": "podcast",  # podcast, audiobook, voice, flat
@@ -107,7 +204,7 @@ AUDIO_ENHANCEMENTS = {
 }
 
 # Chapter markers (for longer content)
-CHAPTER_SETTINGS = {
+CHAPTER_SETTINGS: Final[Dict[str, Any]] = {
     "max_chapter_length": 600,  # seconds (10 minutes)
     "chapter_announcements": True,
     "chapter_fade": True
@@ -115,12 +212,13 @@ CHAPTER_SETTINGS = {
 
 
 # Add a function to check if services are configured
+@functools.cache
 def is_ibm_configured():
     """Check if IBM Watson services are properly configured."""
-    watsonx_configured = bool(IBM_WATSONX_API_KEY and IBM_WATSONX_PROJECT_ID)
-    tts_configured = bool(IBM_TTS_API_KEY)
-    return watsonx_configured, tts_configured
+    settings = _settings()
+    return settings["IBM_WATSONX_READY"], settings["IBM_TTS_READY"]
 
+@functools.cache
 def is_huggingface_configured():
     """Check if Hugging Face is properly configured."""
-    return bool(HUGGINGFACE_API_KEY)
\ No newline at end of file
+    return _settings()["HUGGINGFACE_READY"]
\ No newline at end of file
@@ -2,8 +2,9 @@
 """Configuration settings for EchoVerse application."""
 
 import os
-import streamlit as st
-from typing import Dict, List
+from functools import cache
+from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -103,6 +104,19 @@ AVAILABLE_VOICES = {
     }
 }
 
+# Flattened voice lookups, built once so the UI doesn't walk nested dicts on every rerun
+VOICE_NAMES_BY_LANG = MappingProxyType({lang: tuple(voices) for lang, voices in AVAILABLE_VOICES.items()})
+VOICE_RECORD = MappingProxyType({
+    (lang, name): record
+    for lang, voices in AVAILABLE_VOICES.items()
+    for name, record in voices.items()
+})
+
+# Selectbox option lists, materialized once instead of on every rerun
+TONE_OPTIONS = tuple(AVAILABLE_TONES.keys())
+LANGUAGE_OPTIONS = tuple(AVAILABLE_VOICES.keys())
+SUPPORTED_LANGUAGE_OPTIONS = tuple(SUPPORTED_LANGUAGES.keys())
+
 # Podcast styles
 PODCAST_STYLES = {
     "Conversational": "Friendly, chatty style like a casual conversation",
@@ -111,35 +125,57 @@ PODCAST_STYLES = {
     "News": "Formal, authoritative style like news reporting",
     "Interview": "Question-answer format with multiple voices"
 }
-
-# Try to load from Streamlit secrets, fallback to environment variables
-try:
-    # IBM Watson Configuration
-    IBM_WATSONX_API_KEY = st.secrets.get("IBM_WATSONX_API_KEY", os.getenv("IBM_WATSONX_API_KEY", ""))
-    IBM_WATSONX_API_URL = st.secrets.get("IBM_WATSONX_API_URL", os.getenv("IBM_WATSONX_API_URL", "https://us-south.ml.cloud.ibm.com/ml/v1/text/generation"))
-    IBM_WATSONX_PROJECT_ID = st.secrets.get("IBM_WATSONX_PROJECT_ID", os.getenv("IBM_WATSONX_PROJECT_ID", ""))
-    
-    # IBM Watson Text to Speech Configuration
-    IBM_TTS_API_KEY = st.secrets.get("IBM_TTS_API_KEY", os.getenv("IBM_TTS_API_KEY", ""))
-    IBM_TTS_URL = st.secrets.get("IBM_TTS_URL", os.getenv("IBM_TTS_URL", "https://api.us-south.text-to-speech.watson.cloud.ibm.com"))
-    
-    # Hugging Face Configuration
-    HUGGINGFACE_API_KEY = st.secrets.get("HUGGINGFACE_API_KEY", os.getenv("HUGGINGFACE_API_KEY", ""))
-    HUGGINGFACE_API_URL = st.secrets.get("HUGGINGFACE_API_URL", os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models"))
-except:
-    # Fallback to environment variables only
-    IBM_WATSONX_API_KEY = os.getenv("IBM_WATSONX_API_KEY", "")
-    IBM_WATSONX_API_URL = os.getenv("IBM_WATSONX_API_URL", "https://us-south.ml.cloud.ibm.com/ml/v1/text/generation")
-    IBM_WATSONX_PROJECT_ID = os.getenv("IBM_WATSONX_PROJECT_ID", "")
-    IBM_TTS_API_KEY = os.getenv("IBM_TTS_API_KEY", "")
-    IBM_TTS_URL = os.getenv("IBM_TTS_URL", "https://api.us-south.text-to-speech.watson.cloud.ibm.com")
-    HUGGINGFACE_API_KEY = os.getenv("HUGGINGFACE_API_KEY", "")
-    HUGGINGFACE_API_URL = os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models")
+PODCAST_STYLE_OPTIONS = tuple(PODCAST_STYLES.keys())
+
+# Try to load from Streamlit secrets, fallback to environment variables.
+# Secrets are only consulted when a secrets file exists, because reading
+# st.secrets without one raises instead of returning nothing.
+_SECRETS_FILES = (
+    os.path.join(os.path.expanduser("~"), ".streamlit", "secrets.toml"),
+    os.path.join(".streamlit", "secrets.toml"),
+)
+_HAS_SECRETS_FILE = any(os.path.isfile(path) for path in _SECRETS_FILES)
+
+
+def _secret(key):
+    """Read a Streamlit secret, importing Streamlit only when a secrets file exists."""
+    global _HAS_SECRETS_FILE
+    if not _HAS_SECRETS_FILE:
+        return None
+    import streamlit as st
+    try:
+        return st.secrets.get(key)
+    except Exception as e:
+        # A malformed or unreadable secrets file falls back to environment variables
+        print(f"Could not read Streamlit secrets, using environment variables: {e}")
+        _HAS_SECRETS_FILE = False
+        return None
+
+
+# IBM Watson Configuration
+IBM_WATSONX_API_KEY = _secret("IBM_WATSONX_API_KEY") or os.getenv("IBM_WATSONX_API_KEY", "")
+IBM_WATSONX_API_URL = _secret("IBM_WATSONX_API_URL") or os.getenv("IBM_WATSONX_API_URL", "https://us-south.ml.cloud.ibm.com/ml/v1/text/generation")
+IBM_WATSONX_PROJECT_ID = _secret("IBM_WATSONX_PROJECT_ID") or os.getenv("IBM_WATSONX_PROJECT_ID", "")
+
+# IBM Watson Text to Speech Configuration
+IBM_TTS_API_KEY = _secret("IBM_TTS_API_KEY") or os.getenv("IBM_TTS_API_KEY", "")
+IBM_TTS_URL = _secret("IBM_TTS_URL") or os.getenv("IBM_TTS_URL", "https://api.us-south.text-to-speech.watson.cloud.ibm.com")
+
+# Local Piper TTS: a directory of ONNX voice models named by language code (e.g. en.onnx)
+PIPER_MODELS_DIR = _secret("PIPER_MODELS_DIR") or os.getenv("PIPER_MODELS_DIR", "")
+
+# Hugging Face Configuration
+HUGGINGFACE_API_KEY = _secret("HUGGINGFACE_API_KEY") or os.getenv("HUGGINGFACE_API_KEY", "")
+HUGGINGFACE_API_URL = _secret("HUGGINGFACE_API_URL") or os.getenv("HUGGINGFACE_API_URL", "https://api-inference.huggingface.co/models")
+# Only enable for endpoints that stream server-sent events (e.g. Text Generation Inference)
+HUGGINGFACE_STREAMING = str(_secret("HUGGINGFACE_STREAMING") or os.getenv("HUGGINGFACE_STREAMING", "")).lower() in ("1", "true", "yes")
 
 # File paths
-TEMP_DIR = "temp"
-AUDIO_DIR = os.path.join(TEMP_DIR, "audio")
-ASSETS_DIR = "assets"
+TEMP_DIR = Path("temp")
+AUDIO_DIR = TEMP_DIR / "audio"
+AUDIOBOOK_CACHE_DIR = TEMP_DIR / "cache"
+TTS_CACHE_DIR = TEMP_DIR / "tts_cache"
+ASSETS_DIR = Path("assets")
 
 # AI Service selection
 AI_SERVICE = os.getenv("AI_SERVICE", "huggingface")  # huggingface or ibm
@@ -153,8 +189,8 @@ HUGGINGFACE_MODELS = {
 
 # Podcast settings
 PODCAST_SETTINGS = {
-    "intro_music": os.path.join(ASSETS_DIR, "intro_music.mp3"),
-    "outro_music": os.path.join(ASSETS_DIR, "outro_music.mp3"),
+    "intro_music": ASSETS_DIR / "intro_music.mp3",
+    "outro_music": ASSETS_DIR / "outro_music.mp3",
     "chapter_pause_duration": 1.5,
     "intro_fade_duration": 3.0,
     "default_host": "EchoVerse AI Narrator"
@@ -176,20 +212,31 @@ CHAPTER_SETTINGS = {
 }
 
 
+# Service configuration status never changes after import, so compute it once
+_IBM_CONFIGURED = (bool(IBM_WATSONX_API_KEY and IBM_WATSONX_PROJECT_ID), bool(IBM_TTS_API_KEY))
+_HF_CONFIGURED = bool(HUGGINGFACE_API_KEY)
+
+
 def is_ibm_configured():
     """Check if IBM Watson services are properly configured."""
-    watsonx_configured = bool(IBM_WATSONX_API_KEY and IBM_WATSONX_PROJECT_ID)
-    tts_configured = bool(IBM_TTS_API_KEY)
-    return watsonx_configured, tts_configured
+    return _IBM_CONFIGURED
 
 def is_huggingface_configured():
     """Check if Hugging Face is properly configured."""
-    return bool(HUGGINGFACE_API_KEY)
+    return _HF_CONFIGURED
 
+@cache
 def get_voices_for_language(language):
-    """Get available voices for a specific language."""
-    return AVAILABLE_VOICES.get(language, AVAILABLE_VOICES["English"])
+    """Get available voice names for a specific language."""
+    return VOICE_NAMES_BY_LANG.get(language, VOICE_NAMES_BY_LANG["English"])
+
+def get_voice_info(language, voice):
+    """Get the configuration of a voice, using English voices for unsupported languages."""
+    if language not in VOICE_NAMES_BY_LANG:
+        language = "English"
+    return VOICE_RECORD.get((language, voice), {})
 
+@cache
 def get_podcast_style_description(style):
     """Get description for a podcast style."""
     return PODCAST_STYLES.get(style, "Standard podcast style")
\ No newline at end of file
@@ -2,9 +2,6 @@
 
 import streamlit as st
 import os
-import time
-from text_processor import get_text_processor
-from tts_engine import get_tts_engine
 from utils import (
     setup_directories,
     validate_text_input, 
@@ -13,31 +10,135 @@ from utils import (
     truncate_text,
     estimate_listening_time
 )
-from config import APP_TITLE, APP_SUBTITLE, AVAILABLE_TONES, AVAILABLE_VOICES, is_ibm_configured, is_huggingface_configured, AI_SERVICE
+from config import APP_TITLE, APP_SUBTITLE, AVAILABLE_TONES, AVAILABLE_VOICES, TONE_OPTIONS, LANGUAGE_OPTIONS, is_ibm_configured, is_huggingface_configured, AI_SERVICE
 
 
-def check_environment_setup():
-    """Check if required environment variables are set and provide guidance."""
-    if AI_SERVICE == "ibm":
-        watsonx_configured, tts_configured = is_ibm_configured()
-        huggingface_configured = False
-    else:
-        watsonx_configured, tts_configured = False, False
-        huggingface_configured = is_huggingface_configured()
-    
-    if (AI_SERVICE == "ibm" and (not watsonx_configured or not tts_configured)) or \
-       (AI_SERVICE == "huggingface" and not huggingface_configured):
+# Session state defaults, applied on first load and cleared on reset
+_DEFAULT_STATE = {
+    "original_text": "",
+    "rewritten_text": "",
+    "audio_path": None,
+    "audio_filename": None,
+    "processing_complete": False,
+    "selected_tone": "Neutral",
+    "selected_voice": "Lisa",
+    "podcast_mode": False,
+    "current_word_index": 0
+}
+
+# Custom styling, built once at import instead of on every rerun
+_CSS = """
+    <style>
+    .main-header {
+        font-size: 2.5rem;
+        color: #4361ee;
+        text-align: center;
+        margin-bottom: 1rem;
+    }
+    .sub-header {
+        font-size: 1.2rem;
+        color: #6c757d;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .tone-option {
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border: 2px solid #e9ecef;
+        margin-bottom: 1rem;
+        cursor: pointer;
+    }
+    .tone-option.selected {
+        border-color: #4361ee;
+        background-color: #f0f4ff;
+    }
+    .stat-box {
+        background-color: #f8f9fa;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        margin-bottom: 1rem;
+    }
+    .podcast-badge {
+        background-color: #8B5CF6;
+        color: white;
+        padding: 0.5rem 1rem;
+        border-radius: 0.5rem;
+        font-weight: bold;
+        margin-bottom: 1rem;
+    }
+    .speaking-emoji {
+        font-size: 3rem;
+        text-align: center;
+        margin: 1rem 0;
+        animation: pulse 1.5s infinite;
+    }
+    .speaking-emoji::after {
+        content: "🎵";
+    }
+    .speaking-emoji.playing::after {
+        content: "🗣️";
+        animation: emojiSwap 1.5s steps(5) infinite;
+    }
+    @keyframes pulse {
+        0% { transform: scale(1); }
+        50% { transform: scale(1.1); }
+        100% { transform: scale(1); }
+    }
+    @keyframes emojiSwap {
+        0% { content: "🗣️"; }
+        20% { content: "🎤"; }
+        40% { content: "📢"; }
+        60% { content: "🔊"; }
+        80% { content: "📣"; }
+    }
+    .word-highlight {
+        background-color: #4361ee;
+        color: white;
+        padding: 0.1rem 0.3rem;
+        border-radius: 0.3rem;
+        transition: all 0.3s ease;
+    }
+    </style>
+    """
+
+_HEADER_HTML = f'<h1 class="main-header">🎵 {APP_TITLE}</h1>'
+_SUBHEADER_HTML = f'<p class="sub-header">{APP_SUBTITLE}</p>'
+
+
+@st.cache_resource
+def _inject_css():
+    """Emit the custom CSS; Streamlit replays the cached element on later reruns."""
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+
+@st.cache_data(max_entries=32)
+def _word_count(text: str) -> int:
+    """Count words in the text, cached per distinct text across reruns."""
+    return len(text.split())
+
+
+@st.cache_data(max_entries=32)
+def _char_count(text: str) -> int:
+    """Count characters in the text, cached per distinct text across reruns."""
+    return len(text)
+
+
+@st.cache_resource
+def _render_env_setup(ai_service, watsonx_configured, tts_configured, huggingface_configured):
+    """Render setup guidance; cached per configuration since it cannot change while running."""
+    if (ai_service == "ibm" and (not watsonx_configured or not tts_configured)) or \
+       (ai_service == "huggingface" and not huggingface_configured):
         
         st.sidebar.warning("⚠️ AI Services Not Fully Configured")
         
         with st.sidebar.expander("Setup Instructions"):
             st.write(f"""
-            Currently using: **{AI_SERVICE.upper()}** service
+            Currently using: **{ai_service.upper()}** service
             
             For full functionality, please set up your credentials:
             """)
             
-            if AI_SERVICE == "ibm":
+            if ai_service == "ibm":
                 st.write("""
                 **IBM Watson Services:**
                 1. **IBM Watsonx API Key**: Get from IBM Cloud console
@@ -72,7 +173,7 @@ def check_environment_setup():
             ```
             """)
             
-            if AI_SERVICE == "ibm":
+            if ai_service == "ibm":
                 if not watsonx_configured:
                     st.error("❌ IBM Watsonx not configured - AI text rewriting will use simulated responses")
                 if not tts_configured:
@@ -80,6 +181,18 @@ def check_environment_setup():
             else:
                 if not huggingface_configured:
                     st.error("❌ Hugging Face not configured - AI text rewriting will use simulated responses")
+
+
+def check_environment_setup():
+    """Check if required environment variables are set and provide guidance."""
+    if AI_SERVICE == "ibm":
+        watsonx_configured, tts_configured = is_ibm_configured()
+        huggingface_configured = False
+    else:
+        watsonx_configured, tts_configured = False, False
+        huggingface_configured = is_huggingface_configured()
+    
+    _render_env_setup(AI_SERVICE, watsonx_configured, tts_configured, huggingface_configured)
     
     return True  # Always allow the app to run with fallbacks
 
@@ -132,91 +245,29 @@ def initialize_app():
     setup_directories()
     
     # Apply custom styling
-    st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #4361ee;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #6c757d;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .tone-option {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border: 2px solid #e9ecef;
-        margin-bottom: 1rem;
-        cursor: pointer;
-    }
-    .tone-option.selected {
-        border-color: #4361ee;
-        background-color: #f0f4ff;
-    }
-    .stat-box {
-        background-color: #f8f9fa;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    .podcast-badge {
-        background-color: #8B5CF6;
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 0.5rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .speaking-emoji {
-        font-size: 3rem;
-        text-align: center;
-        margin: 1rem 0;
-        animation: pulse 1.5s infinite;
-    }
-    @keyframes pulse {
-        0% { transform: scale(1); }
-        50% { transform: scale(1.1); }
-        100% { transform: scale(1); }
-    }
-    .word-highlight {
-        background-color: #4361ee;
-        color: white;
-        padding: 0.1rem 0.3rem;
-        border-radius: 0.3rem;
-        transition: all 0.3s ease;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    _inject_css()
     
     # Initialize session state
-    if 'original_text' not in st.session_state:
-        st.session_state.original_text = ""
-    if 'rewritten_text' not in st.session_state:
-        st.session_state.rewritten_text = ""
-    if 'audio_path' not in st.session_state:
-        st.session_state.audio_path = None
-    if 'processing_complete' not in st.session_state:
-        st.session_state.processing_complete = False
-    if 'selected_tone' not in st.session_state:
-        st.session_state.selected_tone = "Neutral"
-    if 'selected_voice' not in st.session_state:
-        st.session_state.selected_voice = "Lisa"
-    if 'podcast_mode' not in st.session_state:
-        st.session_state.podcast_mode = False
-    if 'is_playing' not in st.session_state:
-        st.session_state.is_playing = False
-    if 'current_word_index' not in st.session_state:
-        st.session_state.current_word_index = 0
+    for key, value in _DEFAULT_STATE.items():
+        st.session_state.setdefault(key, value)
+
+
+def _reset_state():
+    """Clear session state so the next run starts a fresh audiobook."""
+    for key in _DEFAULT_STATE:
+        st.session_state.pop(key, None)
+
+
+@st.cache_resource
+def _inject_header():
+    """Emit the header markup; Streamlit replays the cached elements on later reruns."""
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
+    st.markdown(_SUBHEADER_HTML, unsafe_allow_html=True)
 
 
 def render_header():
     """Render the application header."""
-    st.markdown(f'<h1 class="main-header">🎵 {APP_TITLE}</h1>', unsafe_allow_html=True)
-    st.markdown(f'<p class="sub-header">{APP_SUBTITLE}</p>', unsafe_allow_html=True)
+    _inject_header()
 
 
 def render_sidebar_info():
@@ -235,7 +286,7 @@ def render_sidebar_info():
         st.header("🔧 Configuration")
         selected_tone = st.selectbox(
             "Select Tone",
-            options=list(AVAILABLE_TONES.keys()),
+            options=TONE_OPTIONS,
             index=0,
             help="Choose the tone for your audiobook narration"
         )
@@ -244,7 +295,7 @@ def render_sidebar_info():
         
         selected_voice = st.selectbox(
             "Select Voice",
-            options=list(AVAILABLE_VOICES.keys()),
+            options=LANGUAGE_OPTIONS,
             index=0,
             help="Choose the voice for your audiobook"
         )
@@ -254,8 +305,8 @@ def render_sidebar_info():
         # Text statistics
         if st.session_state.original_text:
             st.header("📊 Text Statistics")
-            words = len(st.session_state.original_text.split())
-            chars = len(st.session_state.original_text)
+            words = _word_count(st.session_state.original_text)
+            chars = _char_count(st.session_state.original_text)
             st.metric("Words", words)
             st.metric("Characters", chars)
             st.metric("Estimated Time", f"{round(words/200, 1)} min")
@@ -317,15 +368,12 @@ def process_text_with_ai(text: str, tone: str):
         text: Original text to process
         tone: Selected tone for rewriting
     """
+    # Imported here so the AI client stack only loads when a generation is requested
+    from text_processor import get_text_processor
     text_processor = get_text_processor()
     
     # Show processing status
     with st.spinner("🤖 Rewriting text with AI..."):
-        progress_bar = st.progress(0)
-        for i in range(100):
-            time.sleep(0.02)
-            progress_bar.progress(i + 1)
-        
         rewritten_text = text_processor.rewrite_text(text, tone)
         
     if rewritten_text:
@@ -347,19 +395,17 @@ def generate_audio(text: str, voice: str, tone: str, podcast_mode: bool = False)
         tone: Selected tone (for filename)
         podcast_mode: Whether to apply podcast enhancements
     """
+    # Imported here so gTTS, NLTK and the IBM SDK only load when audio is requested
+    from tts_engine import get_tts_engine
     tts_engine = get_tts_engine()
     
     # Show processing status
     with st.spinner("🎵 Generating audio..."):
-        progress_bar = st.progress(0)
-        for i in range(100):
-            time.sleep(0.01)
-            progress_bar.progress(i + 1)
-        
         result = tts_engine.generate_audio(text, voice, tone, podcast_mode=podcast_mode)
     
     if result['success']:
         st.session_state.audio_path = result['audio_path']
+        st.session_state.audio_filename = os.path.basename(result['audio_path'])
         st.session_state.audio_analysis = result['analysis']
         st.success("✅ Audio generated successfully!")
         return True
@@ -383,18 +429,10 @@ def render_text_comparison(original_text, rewritten_text, tone):
 
 
 def render_speaking_emoji(is_playing=False):
-    """Render animated speaking emoji."""
-    emojis = ["🗣️", "🎤", "📢", "🔊", "📣"]
-    
-    if is_playing:
-        # Animate through emojis
-        emoji_index = int(time.time() * 2) % len(emojis)
-        emoji = emojis[emoji_index]
-        st.markdown(f'<div class="speaking-emoji">{emoji}</div>', unsafe_allow_html=True)
-        st.caption("Speaking...")
-    else:
-        st.markdown(f'<div class="speaking-emoji">🎵</div>', unsafe_allow_html=True)
-        st.caption("Ready to play")
+    """Render speaking emoji; the cycling animation runs in CSS, not on reruns."""
+    state_class = " playing" if is_playing else ""
+    st.markdown(f'<div class="speaking-emoji{state_class}"></div>', unsafe_allow_html=True)
+    st.caption("Speaking..." if is_playing else "Ready to play")
 
 
 def render_audio_player(audio_path, filename):
@@ -405,59 +443,17 @@ def render_audio_player(audio_path, filename):
     if st.session_state.get('podcast_mode', False):
         st.markdown('<div class="podcast-badge">🎙️ Podcast Enhanced</div>', unsafe_allow_html=True)
     
-    # Read audio file
-    with open(audio_path, "rb") as audio_file:
-        audio_bytes = audio_file.read()
-    
     # Create columns for audio player and speaking emoji
     col1, col2 = st.columns([2, 1])
     
     with col1:
         # Display audio player
         audio_placeholder = st.empty()
-        audio_placeholder.audio(audio_bytes, format="audio/mp3")
+        audio_placeholder.audio(audio_path, format="audio/mp3")
     
     with col2:
         # Display speaking emoji
-        render_speaking_emoji(st.session_state.get('is_playing', False))
-    
-    # Add JavaScript for audio playback detection
-    st.markdown("""
-    <script>
-    function checkAudioPlayback() {
-        const audioElement = document.querySelector('audio');
-        if (audioElement) {
-            audioElement.onplay = function() {
-                window.parent.postMessage({type: 'audioPlay', data: true}, '*');
-            };
-            audioElement.onpause = function() {
-                window.parent.postMessage({type: 'audioPlay', data: false}, '*');
-            };
-            audioElement.onended = function() {
-                window.parent.postMessage({type: 'audioPlay', data: false}, '*');
-            };
-        }
-    }
-    
-    // Check for audio element periodically
-    setInterval(checkAudioPlayback, 1000);
-    checkAudioPlayback();
-    </script>
-    """, unsafe_allow_html=True)
-    
-    # Handle messages from JavaScript
-    try:
-        # This is a simplified approach - in a real app you'd use more advanced techniques
-        # to communicate between JS and Python in Streamlit
-        if st.button("▶️ Play Audio"):
-            st.session_state.is_playing = True
-            st.rerun()
-            
-        if st.button("⏸️ Pause Audio"):
-            st.session_state.is_playing = False
-            st.rerun()
-    except:
-        pass
+        render_speaking_emoji()
     
     # Show audio analysis if available
     if hasattr(st.session_state, 'audio_analysis'):
@@ -471,13 +467,14 @@ def render_audio_player(audio_path, filename):
             st.metric("Enhanced", "Yes" if analysis.get('podcast_enhanced', False) else "No")
     
     # Download button
-    st.download_button(
-        label="📥 Download MP3",
-        data=audio_bytes,
-        file_name=filename,
-        mime="audio/mpeg",
-        use_container_width=True
-    )
+    with open(audio_path, "rb") as audio_file:
+        st.download_button(
+            label="📥 Download MP3",
+            data=audio_file,
+            file_name=filename,
+            mime="audio/mpeg",
+            use_container_width=True
+        )
 
 
 def main():
@@ -541,17 +538,10 @@ def main():
     # Display audio player if processing is complete
     if st.session_state.processing_complete and st.session_state.audio_path:
         st.markdown("---")
-        filename = os.path.basename(st.session_state.audio_path)
-        
-        render_audio_player(st.session_state.audio_path, filename)
+        render_audio_player(st.session_state.audio_path, st.session_state.audio_filename)
         
         # Add option to reset and start over
-        if st.button("🔄 Create Another Audiobook", use_container_width=True):
-            # Clear session state
-            for key in ['original_text', 'rewritten_text', 'audio_path', 'processing_complete', 'podcast_mode', 'is_playing']:
-                if key in st.session_state:
-                    del st.session_state[key]
-            st.rerun()
+        st.button("🔄 Create Another Audiobook", on_click=_reset_state, use_container_width=True)
 
 
 if __name__ == "__main__":
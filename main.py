@@ -4,6 +4,10 @@
 import streamlit as st
 import os
 import time
+import json
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from text_processor import get_text_processor
 from tts_engine import get_tts_engine
 from search_engine import get_search_engine
@@ -17,49 +21,132 @@ from utils import (
     estimate_listening_time
 )
 from config import (
-    APP_TITLE, APP_SUBTITLE, AVAILABLE_TONES, AVAILABLE_VOICES, 
-    SUPPORTED_LANGUAGES, PODCAST_STYLES, get_voices_for_language,
-    get_podcast_style_description, is_ibm_configured, is_huggingface_configured, AI_SERVICE
+    APP_TITLE, APP_SUBTITLE, AVAILABLE_TONES, AVAILABLE_VOICES, TONE_OPTIONS,
+    SUPPORTED_LANGUAGES, SUPPORTED_LANGUAGE_OPTIONS, PODCAST_STYLES, PODCAST_STYLE_OPTIONS,
+    get_voices_for_language, get_voice_info,
+    get_podcast_style_description, is_ibm_configured, is_huggingface_configured, AI_SERVICE,
+    AUDIOBOOK_CACHE_DIR, IBM_WATSONX_API_KEY, HUGGINGFACE_API_KEY,
+    IBM_TTS_API_KEY, IBM_TTS_URL, PIPER_MODELS_DIR
 )
 
+# Background workers for slow AI calls, shared by all sessions
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
 
-def check_environment_setup():
-    """Check if required environment variables are set and provide guidance."""
-    if AI_SERVICE == "ibm":
+# Part of the audiobook cache key, so changing the AI credentials or the TTS backend
+# does not serve stale audio
+_CREDENTIALS_HASH = hashlib.sha256("\0".join(map(str, (
+    IBM_WATSONX_API_KEY, HUGGINGFACE_API_KEY, IBM_TTS_API_KEY, IBM_TTS_URL, PIPER_MODELS_DIR
+))).encode("utf-8")).hexdigest()
+# Most recently used audiobooks kept in the on-disk cache
+_AUDIOBOOK_CACHE_MAX_ENTRIES = 32
+
+# Default selectbox positions, resolved once instead of on every rerun
+_LANGUAGE_DEFAULT_INDEX = SUPPORTED_LANGUAGE_OPTIONS.index("Telugu") if "Telugu" in SUPPORTED_LANGUAGES else 0
+_PODCAST_STYLE_DEFAULT_INDEX = PODCAST_STYLE_OPTIONS.index("Educational") if "Educational" in PODCAST_STYLES else 0
+
+# Session state defaults, applied on first load
+_DEFAULT_STATE = {
+    "original_text": "",
+    "rewritten_text": "",
+    "audio_path": None,
+    "audio_ready": False,
+    "processing_complete": False,
+    "selected_tone": "Neutral",
+    "selected_voice": "Alexa",
+    "selected_language": "Telugu",
+    "podcast_mode": False,
+    "podcast_narrator_mode": False,
+    "podcast_topic": "",
+    "podcast_style": "Educational",
+    "show_search": False
+}
+
+# Custom styling, built once at import instead of on every rerun
+_CSS = """
+    <style>
+    .main-header {
+        font-size: 2.5rem;
+        color: #4361ee;
+        text-align: center;
+        margin-bottom: 1rem;
+    }
+    .sub-header {
+        font-size: 1.2rem;
+        color: #6c757d;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .section-header {
+        font-size: 1.5rem;
+        color: #4361ee;
+        margin-top: 2rem;
+        margin-bottom: 1rem;
+        border-bottom: 2px solid #e9ecef;
+        padding-bottom: 0.5rem;
+    }
+    .config-box {
+        background-color: #f8f9fa;
+        padding: 1.5rem;
+        border-radius: 0.5rem;
+        border: 1px solid #e9ecef;
+        margin-bottom: 1.5rem;
+    }
+    .stat-box {
+        background-color: #f0f4ff;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        margin-bottom: 1rem;
+    }
+    .podcast-badge {
+        background-color: #8B5CF6;
+        color: white;
+        padding: 0.5rem 1rem;
+        border-radius: 0.5rem;
+        font-weight: bold;
+        margin-bottom: 1rem;
+    }
+    </style>
+    """
+
+
+@st.cache_resource
+def _inject_css():
+    """Emit the custom CSS; Streamlit replays the cached element on later reruns."""
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _probe_services(ai_service):
+    """Probe service configuration once per process; it cannot change while running."""
+    if ai_service == "ibm":
         watsonx_configured, tts_configured = is_ibm_configured()
-        huggingface_configured = False
-    else:
-        watsonx_configured, tts_configured = False, False
-        huggingface_configured = is_huggingface_configured()
-    
-    if (AI_SERVICE == "ibm" and (not watsonx_configured or not tts_configured)) or \
-       (AI_SERVICE == "huggingface" and not huggingface_configured):
-        
-        st.sidebar.warning("⚠️ AI Services Not Fully Configured")
-        
-        with st.sidebar.expander("Setup Instructions"):
-            st.write(f"""
-            Currently using: **{AI_SERVICE.upper()}** service
-            
-            For full functionality, please set up your credentials:
-            """)
-            
-            if AI_SERVICE == "ibm":
-                st.write("""
+        return watsonx_configured, tts_configured, False
+    return False, False, is_huggingface_configured()
+
+
+@st.cache_data
+def _setup_instructions(ai_service):
+    """Build the setup instruction markdown blocks for the given AI service."""
+    if ai_service == "ibm":
+        service_help = """
                 **IBM Watson Services:**
                 1. **IBM Watsonx API Key**: Get from IBM Cloud console
                 2. **IBM Watsonx Project ID**: Your project ID from Watsonx
                 3. **IBM TTS API Key**: Get from IBM Text to Speech service
-                """)
-            else:
-                st.write("""
+                """
+    else:
+        service_help = """
                 **Hugging Face Service:**
                 1. **Hugging Face API Key**: Get from huggingface.co
                 - Go to huggingface.co → your profile → Settings → Access Tokens
                 - Create a new token and add it to your .env file
-                """)
+                """
+    
+    return f"""
+            Currently using: **{ai_service.upper()}** service
             
-            st.write("""
+            For full functionality, please set up your credentials:
+            """, service_help, """
             **Setup Options:**
             - Create a `.env` file in your project root
             - Set environment variables in your system
@@ -77,7 +164,21 @@ def check_environment_setup():
             HUGGINGFACE_API_KEY=your_huggingface_token_here
             AI_SERVICE=huggingface
             ```
-            """)
+            """
+
+
+def check_environment_setup():
+    """Check if required environment variables are set and provide guidance."""
+    watsonx_configured, tts_configured, huggingface_configured = _probe_services(AI_SERVICE)
+    
+    if (AI_SERVICE == "ibm" and (not watsonx_configured or not tts_configured)) or \
+       (AI_SERVICE == "huggingface" and not huggingface_configured):
+        
+        st.sidebar.warning("⚠️ AI Services Not Fully Configured")
+        
+        with st.sidebar.expander("Setup Instructions"):
+            for block in _setup_instructions(AI_SERVICE):
+                st.write(block)
             
             if AI_SERVICE == "ibm":
                 if not watsonx_configured:
@@ -104,77 +205,11 @@ def initialize_app():
     setup_directories()
     
     # Apply custom styling
-    st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #4361ee;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #6c757d;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .section-header {
-        font-size: 1.5rem;
-        color: #4361ee;
-        margin-top: 2rem;
-        margin-bottom: 1rem;
-        border-bottom: 2px solid #e9ecef;
-        padding-bottom: 0.5rem;
-    }
-    .config-box {
-        background-color: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 0.5rem;
-        border: 1px solid #e9ecef;
-        margin-bottom: 1.5rem;
-    }
-    .stat-box {
-        background-color: #f0f4ff;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    .podcast-badge {
-        background-color: #8B5CF6;
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 0.5rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    _inject_css()
     
     # Initialize session state
-    if 'original_text' not in st.session_state:
-        st.session_state.original_text = ""
-    if 'rewritten_text' not in st.session_state:
-        st.session_state.rewritten_text = ""
-    if 'audio_path' not in st.session_state:
-        st.session_state.audio_path = None
-    if 'processing_complete' not in st.session_state:
-        st.session_state.processing_complete = False
-    if 'selected_tone' not in st.session_state:
-        st.session_state.selected_tone = "Neutral"
-    if 'selected_voice' not in st.session_state:
-        st.session_state.selected_voice = "Alexa"
-    if 'selected_language' not in st.session_state:
-        st.session_state.selected_language = "Telugu"
-    if 'podcast_mode' not in st.session_state:
-        st.session_state.podcast_mode = False
-    if 'podcast_narrator_mode' not in st.session_state:
-        st.session_state.podcast_narrator_mode = False
-    if 'podcast_topic' not in st.session_state:
-        st.session_state.podcast_topic = ""
-    if 'podcast_style' not in st.session_state:
-        st.session_state.podcast_style = "Educational"
-    if 'show_search' not in st.session_state:
-        st.session_state.show_search = False
+    for key, value in _DEFAULT_STATE.items():
+        st.session_state.setdefault(key, value)
 
 
 def render_header():
@@ -183,67 +218,73 @@ def render_header():
     st.markdown(f'<p class="sub-header">{APP_SUBTITLE}</p>', unsafe_allow_html=True)
 
 
+@st.fragment
 def render_sidebar():
-    """Render the sidebar with configuration options."""
-    with st.sidebar:
-        st.markdown("### About EchoVerse")
-        st.write("EchoVerse transforms your text into expressive, downloadable audiobooks using AI technology.")
-        
-        st.markdown("### How It Works")
-        st.write("1. Paste text or upload a file")
-        st.write("2. Choose your preferred tone")
-        st.write("3. Select a voice profile")
-        st.write("4. AI rewrites for expressiveness")
-        st.write("5. Generate & download audio")
-        
-        st.markdown("---")
-        st.markdown("### Configuration")
-        
-        # Language selection
-        selected_language = st.selectbox(
-            "Select Language",
-            options=list(SUPPORTED_LANGUAGES.keys()),
-            index=list(SUPPORTED_LANGUAGES.keys()).index("Telugu") if "Telugu" in SUPPORTED_LANGUAGES else 0,
-            help="Choose the language for your audiobook"
-        )
-        st.session_state.selected_language = selected_language
-        
-        # Get available voices for the selected language
-        language_voices = get_voices_for_language(selected_language)
-        
-        selected_voice = st.selectbox(
-            "Select Voice",
-            options=list(language_voices.keys()),
-            index=0,
-            help="Choose the voice for your audiobook"
-        )
-        st.session_state.selected_voice = selected_voice
-        
-        # Show voice description
-        voice_info = language_voices.get(selected_voice, {})
-        if voice_info:
-            st.info(voice_info.get("description", "No description available"))
-        
-        selected_tone = st.selectbox(
-            "Select Tone",
-            options=list(AVAILABLE_TONES.keys()),
-            index=0,
-            help="Choose the tone for your audiobook narration"
-        )
-        st.session_state.selected_tone = selected_tone
-        st.info(AVAILABLE_TONES[selected_tone]["description"])
-        
-        # Text statistics
-        if st.session_state.original_text:
-            st.markdown("### Text Statistics")
-            words = len(st.session_state.original_text.split())
-            chars = len(st.session_state.original_text)
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Words", words)
-            with col2:
-                st.metric("Characters", chars)
-            st.metric("Estimated Time", f"{round(words/200, 1)} min")
+    """Render the sidebar with configuration options; call within `with st.sidebar`."""
+    st.markdown("### About EchoVerse")
+    st.write("EchoVerse transforms your text into expressive, downloadable audiobooks using AI technology.")
+    
+    st.markdown("### How It Works")
+    st.write("1. Paste text or upload a file")
+    st.write("2. Choose your preferred tone")
+    st.write("3. Select a voice profile")
+    st.write("4. AI rewrites for expressiveness")
+    st.write("5. Generate & download audio")
+    
+    st.markdown("---")
+    st.markdown("### Configuration")
+    
+    # Language selection
+    selected_language = st.selectbox(
+        "Select Language",
+        options=SUPPORTED_LANGUAGE_OPTIONS,
+        index=_LANGUAGE_DEFAULT_INDEX,
+        help="Choose the language for your audiobook"
+    )
+    st.session_state.selected_language = selected_language
+    
+    # Get available voices for the selected language
+    language_voices = get_voices_for_language(selected_language)
+    
+    selected_voice = st.selectbox(
+        "Select Voice",
+        options=language_voices,
+        index=0,
+        help="Choose the voice for your audiobook"
+    )
+    st.session_state.selected_voice = selected_voice
+    
+    # Show voice description
+    voice_info = get_voice_info(selected_language, selected_voice)
+    if voice_info:
+        st.info(voice_info.get("description", "No description available"))
+    
+    selected_tone = st.selectbox(
+        "Select Tone",
+        options=TONE_OPTIONS,
+        index=0,
+        help="Choose the tone for your audiobook narration"
+    )
+    st.session_state.selected_tone = selected_tone
+    st.info(AVAILABLE_TONES[selected_tone]["description"])
+    
+    # Text statistics
+    if st.session_state.original_text:
+        st.markdown("### Text Statistics")
+        words, chars, minutes = _text_stats(st.session_state.original_text)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Words", words)
+        with col2:
+            st.metric("Characters", chars)
+        st.metric("Estimated Time", f"{minutes} min")
+
+
+@st.cache_data(max_entries=32)
+def _text_stats(text):
+    """Count words and characters and estimate reading time, once per distinct text."""
+    words = len(text.split())
+    return words, len(text), round(words / 200, 1)
 
 
 def render_text_input():
@@ -316,8 +357,8 @@ def render_podcast_narrator():
         # Podcast style
         podcast_style = st.selectbox(
             "Podcast Style",
-            options=list(PODCAST_STYLES.keys()),
-            index=list(PODCAST_STYLES.keys()).index("Educational") if "Educational" in PODCAST_STYLES else 0,
+            options=PODCAST_STYLE_OPTIONS,
+            index=_PODCAST_STYLE_DEFAULT_INDEX,
             help="Choose the style for your podcast"
         )
         st.session_state.podcast_style = podcast_style
@@ -326,6 +367,7 @@ def render_podcast_narrator():
         st.info("🎧 The AI will transform your content into a podcast script with intro, structured explanation, and outro.")
 
 
+@st.fragment
 def render_processing_options():
     """Render processing options section."""
     st.markdown('<div class="section-header">Processing Options</div>', unsafe_allow_html=True)
@@ -355,6 +397,7 @@ def render_processing_options():
     if podcast_mode != st.session_state.podcast_mode:
         st.session_state.podcast_mode = podcast_mode
         st.session_state.processing_complete = False
+        st.rerun(scope="app")
     
     # Generate button
     if st.button("🎵 Generate Audiobook", type="primary", use_container_width=True):
@@ -362,22 +405,29 @@ def render_processing_options():
             st.error("Please enter some text to convert.")
             return
         
-        with st.spinner("Processing your audiobook..."):
-            try:
-                # Process text with AI
-                processor = get_text_processor()
-                
-                # Use podcast narrator if enabled
-                if st.session_state.podcast_narrator_mode:
-                    podcast_narrator = get_podcast_narrator()
-                    podcast_script = podcast_narrator.generate_podcast_script(
-                        st.session_state.original_text,
-                        st.session_state.podcast_topic,
-                        st.session_state.podcast_style
-                    )
-                    st.session_state.rewritten_text = podcast_script
-                else:
+        st.session_state.audio_ready = False
+        
+        # Serve a previously generated audiobook for identical inputs
+        cache_key = _audiobook_cache_key(auto_shorten, podcast_mode)
+        if _load_cached_audiobook(cache_key):
+            st.rerun(scope="app")
+        
+        # Use podcast narrator if enabled; the script is written in the background
+        # so widget interactions are not blocked by the slow API call
+        if st.session_state.podcast_narrator_mode:
+            podcast_narrator = get_podcast_narrator()
+            future = _EXECUTOR.submit(
+                podcast_narrator.generate_podcast_script_with_source,
+                st.session_state.original_text,
+                st.session_state.podcast_topic,
+                st.session_state.podcast_style
+            )
+            st.session_state.script_job = (future, auto_shorten, podcast_mode, cache_key)
+        else:
+            with st.spinner("Processing your audiobook..."):
+                try:
                     # Standard text processing
+                    processor = get_text_processor()
                     result = processor.process_text(
                         st.session_state.original_text,
                         st.session_state.selected_tone,
@@ -385,30 +435,158 @@ def render_processing_options():
                         auto_shorten
                     )
                     st.session_state.rewritten_text = result['rewritten_text']
-                
-                # Generate audio
-                tts_engine = get_tts_engine()
-                audio_result = tts_engine.generate_audio(
-                    st.session_state.rewritten_text,
-                    st.session_state.selected_voice,
-                    st.session_state.selected_tone,
-                    st.session_state.selected_language,
-                    auto_shorten,
-                    podcast_mode
-                )
-                
-                if audio_result['success']:
-                    st.session_state.audio_path = audio_result['audio_path']
-                    st.session_state.processing_complete = True
-                    st.session_state.analysis = audio_result['analysis']
-                    st.rerun()
-                else:
-                    st.error(f"Audio generation failed: {audio_result.get('error', 'Unknown error')}")
-                    
-            except Exception as e:
-                st.error(f"An error occurred: {str(e)}")
+                    # Only cache audio built from a real rewrite, not a simulated or fallback one
+                    error = _generate_audio(auto_shorten, podcast_mode, cache_key if result.get('from_api') else None)
+                    if error:
+                        st.error(error)
+                except Exception as e:
+                    st.error(f"An error occurred: {str(e)}")
+    
+    # Failures from the background job are shown here, outside the polling fragment,
+    # so the next poll tick cannot wipe them
+    script_error = st.session_state.pop('script_error', None)
+    if script_error:
+        st.error(script_error)
+    
+    # The poller is only rendered while a job runs, so it stops ticking once the
+    # job finishes and the app reruns
+    if st.session_state.get('script_job'):
+        _poll_script_job()
 
 
+@st.fragment(run_every=1)
+def _poll_script_job():
+    """Wait for a background podcast script, then generate its audio."""
+    job = st.session_state.get('script_job')
+    if job is None:
+        return
+    
+    future, auto_shorten, podcast_mode, cache_key = job
+    if not future.done():
+        st.info("🎙️ Writing your podcast script...")
+        return
+    
+    del st.session_state.script_job
+    try:
+        st.session_state.rewritten_text, from_api = future.result()
+        with st.spinner("Processing your audiobook..."):
+            # Reruns the app on success
+            error = _generate_audio(auto_shorten, podcast_mode, cache_key if from_api else None)
+    except Exception as e:
+        error = f"An error occurred: {str(e)}"
+    
+    st.session_state.script_error = error
+    st.rerun(scope="app")
+
+
+def _audiobook_cache_key(auto_shorten, podcast_mode):
+    """Hash every input that determines the generated audiobook."""
+    state = st.session_state
+    parts = (
+        state.original_text, state.selected_tone, state.selected_voice, state.selected_language,
+        str(auto_shorten), str(podcast_mode), str(state.podcast_narrator_mode),
+        AI_SERVICE, _CREDENTIALS_HASH
+    )
+    if state.podcast_narrator_mode:
+        parts += (state.podcast_topic, state.podcast_style)
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _load_cached_audiobook(cache_key):
+    """Restore a cached audiobook into session state, returning whether one was found."""
+    audio_path = AUDIOBOOK_CACHE_DIR / f"{cache_key}.mp3"
+    meta_path = AUDIOBOOK_CACHE_DIR / f"{cache_key}.json"
+    if not (audio_path.is_file() and meta_path.is_file()):
+        return False
+    
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        rewritten_text, analysis = meta["rewritten_text"], meta["analysis"]
+        # Mark the entry as recently used so pruning keeps it
+        os.utime(meta_path)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Ignoring unreadable audiobook cache entry: {e}")
+        return False
+    
+    st.session_state.audio_path = str(audio_path)
+    st.session_state.audio_ready = True
+    st.session_state.rewritten_text = rewritten_text
+    st.session_state.analysis = analysis
+    st.session_state.processing_complete = True
+    return True
+
+
+def _write_atomically(path, data):
+    """Write bytes through a temp file and os.replace, so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _store_cached_audiobook(cache_key, audio_path):
+    """Copy a generated audiobook into the cache; metadata is written last so hits are complete."""
+    try:
+        os.makedirs(AUDIOBOOK_CACHE_DIR, exist_ok=True)
+        with open(audio_path, "rb") as f:
+            _write_atomically(AUDIOBOOK_CACHE_DIR / f"{cache_key}.mp3", f.read())
+        meta = {
+            "rewritten_text": st.session_state.rewritten_text,
+            "analysis": st.session_state.analysis
+        }
+        _write_atomically(AUDIOBOOK_CACHE_DIR / f"{cache_key}.json", json.dumps(meta, default=str).encode("utf-8"))
+    except OSError as e:
+        print(f"Error caching audiobook: {e}")
+    
+    _prune_audiobook_cache()
+
+
+def _prune_audiobook_cache(max_entries=_AUDIOBOOK_CACHE_MAX_ENTRIES):
+    """Drop the least recently used cached audiobooks beyond max_entries."""
+    try:
+        metas = sorted(AUDIOBOOK_CACHE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for meta_path in metas[max_entries:]:
+            meta_path.unlink(missing_ok=True)
+            meta_path.with_suffix(".mp3").unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Audiobook cache cleanup failed: {e}")
+
+
+def _generate_audio(auto_shorten, podcast_mode, cache_key):
+    """
+    Generate audio for the rewritten text and show the results on success.
+    
+    A cache_key of None skips caching. Returns an error message on failure.
+    """
+    tts_engine = get_tts_engine()
+    audio_result = tts_engine.generate_audio(
+        st.session_state.rewritten_text,
+        st.session_state.selected_voice,
+        st.session_state.selected_tone,
+        st.session_state.selected_language,
+        auto_shorten,
+        podcast_mode
+    )
+    
+    if audio_result['success']:
+        st.session_state.audio_path = audio_result['audio_path']
+        st.session_state.audio_ready = True
+        st.session_state.processing_complete = True
+        st.session_state.analysis = audio_result['analysis']
+        # Audio from a fallback TTS backend is not cached, like fallback rewrites
+        if cache_key and not audio_result.get('tts_fallback', True):
+            _store_cached_audiobook(cache_key, audio_result['audio_path'])
+        st.rerun(scope="app")
+    
+    return f"Audio generation failed: {audio_result.get('error', 'Unknown error')}"
+
+
+@st.fragment
 def render_results():
     """Render the results section."""
     if not st.session_state.processing_complete:
@@ -417,9 +595,8 @@ def render_results():
     st.markdown('<div class="section-header">Your Audiobook is Ready!</div>', unsafe_allow_html=True)
     
     # Display analysis results
-    if hasattr(st.session_state, 'analysis'):
-        analysis = st.session_state.analysis
-        
+    analysis = st.session_state.get('analysis')
+    if analysis:
         col1, col2, col3 = st.columns(3)
         
         with col1:
@@ -432,25 +609,43 @@ def render_results():
             st.metric("Format", "Podcast" if analysis.get('podcast_enhanced', False) else "Standard")
     
     # Audio player
-    if st.session_state.audio_path and os.path.exists(st.session_state.audio_path):
-        st.audio(st.session_state.audio_path, format="audio/mp3")
-        
-        # Download button
-        with open(st.session_state.audio_path, "rb") as f:
-            audio_bytes = f.read()
-        
-        st.download_button(
-            label="⬇️ Download Audiobook",
-            data=audio_bytes,
-            file_name=os.path.basename(st.session_state.audio_path),
-            mime="audio/mp3",
-            use_container_width=True
-        )
+    audio_path = st.session_state.audio_path
+    if st.session_state.audio_ready:
+        try:
+            audio_bytes = _load_audio_bytes(audio_path)
+        except OSError:
+            # The file was cleaned up since it was generated
+            st.session_state.audio_ready = False
+            st.warning("The audio file is no longer available. Please generate it again.")
+        else:
+            st.audio(audio_bytes, format="audio/mp3")
+            
+            # Download button
+            st.download_button(
+                label="⬇️ Download Audiobook",
+                data=audio_bytes,
+                file_name=os.path.basename(audio_path),
+                mime="audio/mp3",
+                use_container_width=True
+            )
     
     # Display processed text
-    if st.session_state.rewritten_text:
+    rewritten_text = st.session_state.rewritten_text
+    if rewritten_text:
         with st.expander("View Processed Text"):
-            st.write(st.session_state.rewritten_text)
+            st.write(rewritten_text)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _load_audio_bytes(path):
+    """
+    Read an audio file once instead of on every rerun.
+    
+    Keyed on the path alone: generated names are unique per generation, and a
+    cache entry path is always rewritten from identical inputs.
+    """
+    with open(path, "rb") as f:
+        return f.read()
 
 
 def main():
@@ -465,7 +660,8 @@ def main():
     render_header()
     
     # Render sidebar
-    render_sidebar()
+    with st.sidebar:
+        render_sidebar()
     
     # Main content
     render_text_input()
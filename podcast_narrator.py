@@ -1,12 +1,55 @@
 # podcast_narrator.py
 """AI Podcast Narrator module for EchoVerse application."""
 
+import hashlib
 import streamlit as st
 import requests
 import json
-import time  # Added missing import
-from typing import Dict, Any
-from config import HUGGINGFACE_API_KEY, HUGGINGFACE_API_URL, AI_SERVICE, PODCAST_STYLES
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+from config import HUGGINGFACE_API_KEY, HUGGINGFACE_API_URL, HUGGINGFACE_STREAMING, AI_SERVICE, PODCAST_STYLES
+
+
+# Style-specific instructions for the podcast prompt
+_STYLE_PROMPTS: Mapping[str, str] = MappingProxyType({
+    "Conversational": "Create a friendly, chatty podcast script like a casual conversation between friends.",
+    "Educational": "Create an informative, educational podcast script that explains concepts clearly.",
+    "Storytelling": "Create a narrative podcast script with dramatic elements and storytelling techniques.",
+    "News": "Create a formal, news-style podcast script with authoritative reporting.",
+    "Interview": "Create an interview-style podcast script with questions and answers."
+})
+
+_PROMPT_TMPL = """
+        Transform the following content into an engaging podcast script. 
+        {style_prompt}
+        
+        Guidelines:
+        - Use a conversational tone appropriate for the {style_lower} style
+        - Break down complex ideas into simple, digestible parts
+        - Use analogies and examples to make concepts relatable
+        - Add a brief introduction and conclusion
+        - Keep it engaging and easy to follow
+        
+        Topic: {topic}
+        Style: {style}
+        
+        Content to transform:
+        {content}
+        
+        Podcast Script:
+        """
+
+# Paragraph templates per style: (first paragraph, following paragraphs)
+_PARAGRAPH_FORMATS: Mapping[str, Tuple[str, str]] = MappingProxyType({
+    "Educational": ("To begin with, {}", "Another important point: {}"),
+    "Conversational": ("So, here's the thing: {}", "And you know what else? {}"),
+    "Storytelling": ("As the story goes, {}", "As the story goes, {}"),
+    "News": ("Reports indicate that {}", "Reports indicate that {}"),
+    "Interview": ("Our expert explains: {}", "Our expert explains: {}")
+})
+
 
 class PodcastNarrator:
     """Transforms content into engaging podcast scripts using AI."""
@@ -14,11 +57,27 @@ class PodcastNarrator:
     def __init__(self):
         self.api_key = HUGGINGFACE_API_KEY
         self.api_url = HUGGINGFACE_API_URL
+        # Part of the script cache key, so rotating the key invalidates cached scripts
+        self._api_key_hash = hashlib.sha256(self.api_key.encode()).hexdigest()
+        
+        # Reuse connections across requests; the adapter handles retries with backoff
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+        # Honour Retry-After so a cold model gets the wait time the API asks for
+        retries = Retry(total=2, backoff_factor=1, status_forcelist=(502, 503, 504),
+                        allowed_methods=frozenset({"POST"}), respect_retry_after_header=True)
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retries))
     
     def generate_podcast_script(self, content: str, topic: str = "", style: str = "Educational") -> str:
         """
         Generate a podcast-style script from the given content using AI.
         
+        Results are cached, so repeating a request with the same content,
+        topic and style skips the API call.
+        
         Args:
             content: The text content to transform into a podcast script
             topic: Optional topic description for context
@@ -27,63 +86,48 @@ class PodcastNarrator:
         Returns:
             Formatted podcast script
         """
-        # Use a more specific model for conversation and explanation
-        model = "microsoft/DialoGPT-medium"  # Use a reliable model
-        
-        # Create a more detailed prompt based on style
-        style_prompts = {
-            "Conversational": "Create a friendly, chatty podcast script like a casual conversation between friends.",
-            "Educational": "Create an informative, educational podcast script that explains concepts clearly.",
-            "Storytelling": "Create a narrative podcast script with dramatic elements and storytelling techniques.",
-            "News": "Create a formal, news-style podcast script with authoritative reporting.",
-            "Interview": "Create an interview-style podcast script with questions and answers."
-        }
-        
-        style_prompt = style_prompts.get(style, style_prompts["Educational"])
-        
-        prompt = f"""
-        Transform the following content into an engaging podcast script. 
-        {style_prompt}
-        
-        Guidelines:
-        - Use a conversational tone appropriate for the {style.lower()} style
-        - Break down complex ideas into simple, digestible parts
-        - Use analogies and examples to make concepts relatable
-        - Add a brief introduction and conclusion
-        - Keep it engaging and easy to follow
-        
-        Topic: {topic if topic else 'General explanation'}
-        Style: {style}
-        
-        Content to transform:
-        {content}
+        return self.generate_podcast_script_with_source(content, topic, style)[0]
+    
+    def generate_podcast_script_with_source(self, content: str, topic: str = "",
+                                            style: str = "Educational") -> Tuple[str, bool]:
+        """
+        Generate a podcast script and report whether it came from the AI service.
         
-        Podcast Script:
+        Returns:
+            Tuple of (script, from_api); from_api is False for the template fallback
         """
+        if self.api_key:
+            try:
+                return _cached_script(self, content, topic, style, self._api_key_hash), True
+            except Exception as e:
+                print(f"Error generating podcast script: {e}")
         
-        try:
-            # Try to use Hugging Face API for better results
-            if self.api_key:
-                script = self._make_huggingface_request(prompt, model)
-                if script and script != content:
-                    return script
-            
-            # Fallback to simulated response if API fails or not configured
-            return self._create_podcast_script(content, topic, style)
-            
-        except Exception as e:
-            print(f"Error generating podcast script: {e}")
-            return self._create_podcast_script(content, topic, style)
+        # Fallback to the template outside the cache, so failures are not memoized
+        return self._create_podcast_script(content, topic, style), False
+    
+    def _generate_uncached(self, content: str, topic: str, style: str) -> str:
+        """Generate a podcast script with the API; raises if it returns nothing usable."""
+        # Use a more specific model for conversation and explanation
+        model = "microsoft/DialoGPT-medium"  # Use a reliable model
+        
+        prompt = _PROMPT_TMPL.format(
+            style_prompt=_STYLE_PROMPTS.get(style, _STYLE_PROMPTS["Educational"]),
+            style=style,
+            style_lower=style.lower(),
+            topic=topic or "General explanation",
+            content=content
+        )
+        
+        script = self._make_huggingface_request(prompt, model)
+        if not script or script == content:
+            # Raise rather than return, so a failed request is not cached
+            raise RuntimeError("Hugging Face returned no podcast script")
+        return script
     
-    def _make_huggingface_request(self, prompt: str, model: str, max_retries: int = 2) -> str:
+    def _make_huggingface_request(self, prompt: str, model: str) -> Optional[str]:
         """Make API request to Hugging Face for podcast script generation."""
         api_url = f"{self.api_url}/{model}"
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "inputs": prompt,
             "parameters": {
@@ -93,17 +137,17 @@ class PodcastNarrator:
                 "return_full_text": False
             }
         }
+        if HUGGINGFACE_STREAMING:
+            # The classic Inference API does not stream and may reject the extra key
+            payload["stream"] = True
         
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=45
-                )
-                
+        try:
+            with self._session.post(api_url, json=payload, timeout=45, stream=HUGGINGFACE_STREAMING) as response:
                 if response.status_code == 200:
+                    # Endpoints that support streaming answer with server-sent events
+                    if response.headers.get("Content-Type", "").startswith("text/event-stream"):
+                        return "".join(self._iter_stream_tokens(response)).strip()
+                    
                     result = response.json()
                     if isinstance(result, list) and len(result) > 0:
                         return result[0].get("generated_text", "").strip()
@@ -111,21 +155,28 @@ class PodcastNarrator:
                         return result.get("generated_text", "").strip()
                 else:
                     print(f"Hugging Face API request failed with status {response.status_code}")
-                    # Fallback to simulation if API fails
-                    return self._create_podcast_script(prompt.split("Content to transform:")[-1] if "Content to transform:" in prompt else prompt, "", "Educational")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"Hugging Face Request attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                    
-        return self._create_podcast_script(prompt.split("Content to transform:")[-1] if "Content to transform:" in prompt else prompt, "", "Educational")
+                
+        except requests.exceptions.RequestException as e:
+            print(f"Hugging Face request failed: {e}")
+        
+        return None
+    
+    @staticmethod
+    def _iter_stream_tokens(response):
+        """Yield generated token text from a streamed Hugging Face response."""
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            token = json.loads(data).get("token", {})
+            if not token.get("special", False):
+                yield token.get("text", "")
     
-    def _create_podcast_script(self, content: str, topic: str, style: str) -> str:
+    @staticmethod
+    def _create_podcast_script(content: str, topic: str, style: str) -> str:
         """Create a podcast script with proper formatting and structure."""
-        # Clean and prepare the content
-        paragraphs = [p for p in content.split('\n') if p.strip()]
-        
         # Create introduction based on style
         if style == "Educational":
             intro = f"Welcome to the EchoVerse Podcast. I'm your host, and today we're exploring {topic.lower() if topic else 'an important topic'}.\n\n"
@@ -143,29 +194,12 @@ class PodcastNarrator:
         intro += "Let's dive right in.\n\n"
         
         # Transform content into podcast format based on style
-        podcast_content = []
-        
-        for i, paragraph in enumerate(paragraphs):
-            if paragraph.strip():
-                # Add style-specific elements
-                if style == "Educational":
-                    if i == 0:
-                        podcast_content.append(f"To begin with, {paragraph.strip()}")
-                    else:
-                        podcast_content.append(f"Another important point: {paragraph.strip()}")
-                elif style == "Conversational":
-                    if i == 0:
-                        podcast_content.append(f"So, here's the thing: {paragraph.strip()}")
-                    else:
-                        podcast_content.append(f"And you know what else? {paragraph.strip()}")
-                elif style == "Storytelling":
-                    podcast_content.append(f"As the story goes, {paragraph.strip()}")
-                elif style == "News":
-                    podcast_content.append(f"Reports indicate that {paragraph.strip()}")
-                elif style == "Interview":
-                    podcast_content.append(f"Our expert explains: {paragraph.strip()}")
-                else:
-                    podcast_content.append(paragraph.strip())
+        first_format, rest_format = _PARAGRAPH_FORMATS.get(style, ("{}", "{}"))
+        paragraphs = (p for p in map(str.strip, content.splitlines()) if p)
+        body = ' '.join(
+            (first_format if i == 0 else rest_format).format(paragraph)
+            for i, paragraph in enumerate(paragraphs)
+        )
         
         # Add conclusion based on style
         if style == "Educational":
@@ -183,14 +217,17 @@ class PodcastNarrator:
         
         outro += "\n\nThis has been an EchoVerse production."
         
-        return intro + ' '.join(podcast_content) + outro
+        return intro + body + outro
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _cached_script(_narrator: PodcastNarrator, content: str, topic: str, style: str,
+                   api_key_hash: str) -> str:
+    """Cache generated scripts per (content, topic, style, API key); the narrator is not hashed."""
+    return _narrator._generate_uncached(content, topic, style)
 
-# Singleton instance
-_podcast_narrator_instance = None
 
+@st.cache_resource
 def get_podcast_narrator() -> PodcastNarrator:
     """Get singleton instance of PodcastNarrator."""
-    global _podcast_narrator_instance
-    if _podcast_narrator_instance is None:
-        _podcast_narrator_instance = PodcastNarrator()
-    return _podcast_narrator_instance
\ No newline at end of file
+    return PodcastNarrator()
\ No newline at end of file
@@ -2,29 +2,113 @@
 
 import os
 import json
+import functools
+import atexit
+import threading
 import sqlite3
 import re
 import urllib.parse
 import streamlit as st
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from config import AUDIO_DIR, TEMP_DIR
 from utils import truncate_text
 
+# Patterns and lookups used on every search, compiled once at import
+_URL_RE = re.compile(r'https?://[^\s]+')
+_WORD_RE = re.compile(r'\b\w+\b')
+_STOPWORD_PATH_PARTS = frozenset({'wiki', 'wikipedia', 'page', 'article'})
+# Common words that match nearly every document and only dilute OR queries
+_STOPWORDS = frozenset({
+    'the', 'and', 'for', 'with', 'that', 'this', 'have', 'from', 'are', 'was',
+    'were', 'but', 'not', 'you', 'your', 'our', 'its', 'his', 'her', 'she',
+    'him', 'they', 'them', 'their', 'there', 'then', 'than', 'what', 'which',
+    'who', 'whom', 'when', 'where', 'why', 'how', 'all', 'any', 'can', 'had',
+    'has', 'into', 'about', 'been', 'being', 'will', 'would', 'could', 'should',
+    'also', 'just', 'over', 'such', 'these', 'those', 'very',
+})
+
+# Bump when _create_schema changes so existing databases are migrated
+_SCHEMA_VERSION = 1
+
+
+@functools.lru_cache(maxsize=2048)
+def _tokenize(text: str) -> Tuple[str, ...]:
+    """Simple text tokenization, cached since the same queries repeat across reruns."""
+    # Remove punctuation and split into words
+    return tuple(_WORD_RE.findall(text))
+
+
 class SearchEngine:
     """Handles indexing and searching of audiobook content."""
     
+    # Static statistics queries, kept as constants so each hits the statement cache
+    _SQL_TOTALS = ("SELECT COUNT(*), COALESCE(SUM(word_count), 0), "
+                   "COALESCE(SUM(duration_minutes), 0.0) FROM content")
+    _SQL_BY_TONE = "SELECT tone, COUNT(*) FROM content GROUP BY tone"
+    _SQL_BY_VOICE = "SELECT voice, COUNT(*) FROM content GROUP BY voice"
+    
+    # Insert or update keyed on audio_path, shared by single and bulk indexing
+    _SQL_UPSERT = '''
+        INSERT INTO content 
+        (title, original_text, rewritten_text, tone, voice, audio_path, word_count, duration_minutes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(audio_path) DO UPDATE
+        SET title = excluded.title, original_text = excluded.original_text,
+            rewritten_text = excluded.rewritten_text, tone = excluded.tone,
+            voice = excluded.voice, word_count = excluded.word_count,
+            duration_minutes = excluded.duration_minutes,
+            created_at = CURRENT_TIMESTAMP
+    '''
+    _SQL_RECENT = '''
+        SELECT id, title, original_text, rewritten_text, tone, voice,
+               audio_path, created_at, word_count, duration_minutes
+        FROM content
+        ORDER BY created_at DESC
+        LIMIT ?
+    '''
+    _FTS_TRIGGERS = ('content_ai', 'content_ad', 'content_au')
+    
     def __init__(self):
         self.db_path = os.path.join(TEMP_DIR, "echoverse_search.db")
-        self._init_database()
-    
-    def _init_database(self):
-        """Initialize the search database."""
         os.makedirs(TEMP_DIR, exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # One shared connection; the instance is shared across sessions, so guard it with a lock
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        atexit.register(self._conn.close)
         
+        self._init_database()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for WAL mode and relaxed syncing."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        conn.executescript('''
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -20000;
+            PRAGMA mmap_size = 268435456;
+        ''')
+        # Rows convert straight to dicts keyed by column name
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _init_database(self):
+        """Initialize the search database, skipping the DDL when the schema is current."""
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= _SCHEMA_VERSION:
+                return
+            
+            # Explicit BEGIN so all the DDL lands in one commit
+            cursor.execute("BEGIN")
+            self._create_schema(cursor)
+            cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    
+    def _create_schema(self, cursor):
+        """Create tables, full-text index, triggers and indexes if missing."""
         # Create content table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS content (
@@ -41,24 +125,62 @@ class SearchEngine:
             )
         ''')
         
-        # Create search index table
+        # Check before creating, so content indexed before the FTS table existed gets backfilled
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'content_fts'")
+        fts_exists = cursor.fetchone() is not None
+        
+        # Full-text index over the content table (external content, so text is not stored twice)
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS search_index (
-                content_id INTEGER,
-                token TEXT,
-                frequency INTEGER,
-                FOREIGN KEY (content_id) REFERENCES content (id)
+            CREATE VIRTUAL TABLE IF NOT EXISTS content_fts USING fts5(
+                title, original_text, rewritten_text,
+                content='content', content_rowid='id', tokenize='porter unicode61'
             )
         ''')
         
+        # Older databases have an update trigger that re-indexes unconditionally
+        cursor.execute('DROP TRIGGER IF EXISTS content_au')
+        self._create_fts_triggers(cursor)
+        
+        if not fts_exists:
+            cursor.execute("INSERT INTO content_fts(content_fts) VALUES ('rebuild')")
+        
+        # The token table is superseded by content_fts
+        cursor.execute('DROP TABLE IF EXISTS search_index')
+        
         # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_token ON search_index(token)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_tone ON content(tone)')
+        # Matches the tone + voice filters and created_at ordering of search_content;
+        # its tone prefix also serves tone-only filters, so idx_content_tone is redundant
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_filter ON content(tone, voice, created_at DESC)')
+        cursor.execute('DROP INDEX IF EXISTS idx_content_tone')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_voice ON content(voice)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_created ON content(created_at)')
-        
-        conn.commit()
-        conn.close()
+    
+    def _create_fts_triggers(self, cursor):
+        """Create the triggers that keep the full-text index in sync with the content table."""
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS content_ai AFTER INSERT ON content BEGIN
+                INSERT INTO content_fts(rowid, title, original_text, rewritten_text)
+                VALUES (new.id, new.title, new.original_text, new.rewritten_text);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS content_ad AFTER DELETE ON content BEGIN
+                INSERT INTO content_fts(content_fts, rowid, title, original_text, rewritten_text)
+                VALUES ('delete', old.id, old.title, old.original_text, old.rewritten_text);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS content_au AFTER UPDATE ON content
+            WHEN old.title IS NOT new.title
+              OR old.original_text IS NOT new.original_text
+              OR old.rewritten_text IS NOT new.rewritten_text
+            BEGIN
+                INSERT INTO content_fts(content_fts, rowid, title, original_text, rewritten_text)
+                VALUES ('delete', old.id, old.title, old.original_text, old.rewritten_text);
+                INSERT INTO content_fts(rowid, title, original_text, rewritten_text)
+                VALUES (new.id, new.title, new.original_text, new.rewritten_text);
+            END
+        ''')
     
     def _extract_keywords_from_url(self, query: str) -> str:
         """
@@ -71,8 +193,7 @@ class SearchEngine:
             Extracted keywords for searching
         """
         # Check if it looks like a URL
-        url_pattern = r'https?://[^\s]+'
-        if re.match(url_pattern, query):
+        if _URL_RE.match(query):
             try:
                 # Parse URL and extract meaningful parts
                 parsed_url = urllib.parse.urlparse(query)
@@ -81,7 +202,7 @@ class SearchEngine:
                 # Get the last meaningful part of the path (usually the title)
                 keywords = []
                 for part in reversed(path_parts):
-                    if part and part not in ['wiki', 'wikipedia', 'page', 'article']:
+                    if part and part not in _STOPWORD_PATH_PARTS:
                         # Replace underscores and hyphens with spaces
                         clean_part = part.replace('_', ' ').replace('-', ' ').replace('%20', ' ')
                         keywords.append(clean_part)
@@ -113,78 +234,62 @@ class SearchEngine:
             Success status
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if content already exists
-            cursor.execute(
-                "SELECT id FROM content WHERE audio_path = ?",
-                (audio_path,)
-            )
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Update existing record
-                cursor.execute('''
-                    UPDATE content 
-                    SET title = ?, original_text = ?, rewritten_text = ?, 
-                        tone = ?, voice = ?, word_count = ?, duration_minutes = ?,
-                        created_at = CURRENT_TIMESTAMP
-                    WHERE audio_path = ?
-                ''', (title, original_text, rewritten_text, tone, voice, 
-                      word_count, duration_minutes, audio_path))
-                content_id = existing[0]
-                
-                # Remove old search index
-                cursor.execute(
-                    "DELETE FROM search_index WHERE content_id = ?",
-                    (content_id,)
-                )
-            else:
-                # Insert new record
-                cursor.execute('''
-                    INSERT INTO content 
-                    (title, original_text, rewritten_text, tone, voice, audio_path, word_count, duration_minutes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (title, original_text, rewritten_text, tone, voice, 
-                      audio_path, word_count, duration_minutes))
-                content_id = cursor.lastrowid
-            
-            # Index text content
-            self._index_text_content(cursor, content_id, original_text + " " + rewritten_text)
-            
-            conn.commit()
+            # Insert or update in one statement and one transaction;
+            # content_fts is updated by the content table triggers
+            with self._lock, self._conn:
+                self._conn.execute(self._SQL_UPSERT, (title, original_text, rewritten_text, tone, voice, 
+                                                      audio_path, word_count, duration_minutes))
             return True
             
         except Exception as e:
             print(f"Error indexing content: {e}")
             return False
-        finally:
-            conn.close()
     
-    def _index_text_content(self, cursor, content_id: int, text: str):
-        """Index text content for searching."""
-        # Simple tokenization (improve with NLTK if available)
-        tokens = self._tokenize_text(text.lower())
-        token_freq = {}
+    def bulk_index(self, records: List[Dict[str, Any]]) -> bool:
+        """
+        Index many items in one transaction.
         
-        # Count token frequencies
-        for token in tokens:
-            if len(token) > 2:  # Ignore very short tokens
-                token_freq[token] = token_freq.get(token, 0) + 1
+        The sync triggers are dropped for the load and the full-text index is
+        rebuilt once at the end, instead of being updated row by row.
         
-        # Insert into search index
-        for token, frequency in token_freq.items():
-            cursor.execute(
-                "INSERT INTO search_index (content_id, token, frequency) VALUES (?, ?, ?)",
-                (content_id, token, frequency)
-            )
+        Args:
+            records: Dicts with the same keys as the index_content arguments
+            
+        Returns:
+            Success status
+        """
+        rows = [
+            (r['title'], r.get('original_text'), r.get('rewritten_text'), r.get('tone'),
+             r.get('voice'), r['audio_path'], r.get('word_count'), r.get('duration_minutes'))
+            for r in records
+        ]
+        if not rows:
+            return True
+        
+        try:
+            with self._lock, self._conn:
+                cursor = self._conn.cursor()
+                # Explicit BEGIN so the trigger DDL is part of the same transaction
+                cursor.execute("BEGIN")
+                for trigger in self._FTS_TRIGGERS:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                cursor.executemany(self._SQL_UPSERT, rows)
+                cursor.execute("INSERT INTO content_fts(content_fts) VALUES ('rebuild')")
+                self._create_fts_triggers(cursor)
+            return True
+            
+        except Exception as e:
+            print(f"Error bulk indexing content: {e}")
+            return False
     
-    def _tokenize_text(self, text: str) -> List[str]:
-        """Simple text tokenization."""
-        # Remove punctuation and split into words
-        words = re.findall(r'\b\w+\b', text)
-        return words
+    def _build_fts_query(self, text: str) -> str:
+        """Build an FTS5 query matching any of the tokens in text, by prefix."""
+        # Repeated words add nothing to an OR query, so keep each token once
+        tokens = dict.fromkeys(_tokenize(text.lower()))
+        # Drop short words, stopwords and bare numbers, unless that would leave nothing to search for
+        tokens = [t for t in tokens
+                  if len(t) > 2 and t not in _STOPWORDS and not t.isdigit()] or list(tokens)
+        return " OR ".join(f'"{token}"*' for token in tokens)
     
     def search_content(self, query: str, tone_filter: Optional[str] = None, 
                       voice_filter: Optional[str] = None, 
@@ -204,39 +309,26 @@ class SearchEngine:
             List of search results
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Preprocess query - extract keywords if it's a URL
             processed_query = self._extract_keywords_from_url(query)
-            search_tokens = self._tokenize_text(processed_query.lower())
+            fts_query = self._build_fts_query(processed_query)
+            
+            sql = '''
+                SELECT c.id, c.title, c.original_text, c.rewritten_text, 
+                       c.tone, c.voice, c.audio_path, c.created_at,
+                       c.word_count, c.duration_minutes
+                FROM content c
+            '''
+            where_clauses = []
+            params = []
             
-            if not search_tokens:
-                # If no search tokens, return recent content
-                sql = '''
-                    SELECT c.id, c.title, c.original_text, c.rewritten_text, 
-                           c.tone, c.voice, c.audio_path, c.created_at,
-                           c.word_count, c.duration_minutes
-                    FROM content c
-                '''
-                params = []
-            else:
-                # Build search with relevance scoring
-                sql = '''
-                    SELECT c.id, c.title, c.original_text, c.rewritten_text, 
-                           c.tone, c.voice, c.audio_path, c.created_at,
-                           c.word_count, c.duration_minutes,
-                           SUM(si.frequency) as relevance
-                    FROM content c
-                    JOIN search_index si ON c.id = si.content_id
-                    WHERE si.token IN ({})
-                '''.format(','.join(['?'] * len(search_tokens)))
-                
-                params = search_tokens
+            if fts_query:
+                # Rank matches with the full-text index
+                sql += " JOIN content_fts ON content_fts.rowid = c.id"
+                where_clauses.append("content_fts MATCH ?")
+                params.append(fts_query)
             
             # Add filters
-            where_clauses = []
-            
             if tone_filter:
                 where_clauses.append("c.tone = ?")
                 params.append(tone_filter)
@@ -248,145 +340,111 @@ class SearchEngine:
             if date_filter:
                 date_condition = self._get_date_filter_condition(date_filter)
                 if date_condition:
-                    where_clauses.append(date_condition)
+                    clause, date_params = date_condition
+                    where_clauses.append(clause)
+                    params.extend(date_params)
             
             if where_clauses:
-                sql += " AND " + " AND ".join(where_clauses)
+                sql += " WHERE " + " AND ".join(where_clauses)
             
-            # Group and order
-            if search_tokens:
-                sql += '''
-                    GROUP BY c.id
-                    ORDER BY relevance DESC, c.created_at DESC
-                '''
+            # Order by relevance (lower bm25 is better), newest first otherwise
+            if fts_query:
+                sql += " ORDER BY bm25(content_fts), c.created_at DESC"
             else:
                 sql += " ORDER BY c.created_at DESC"
             
             sql += " LIMIT ?"
             params.append(limit)
             
-            cursor.execute(sql, params)
-            results = cursor.fetchall()
-            
-            # Format results
-            formatted_results = []
-            for row in results:
-                formatted_results.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'original_text': row[2],
-                    'rewritten_text': row[3],
-                    'tone': row[4],
-                    'voice': row[5],
-                    'audio_path': row[6],
-                    'created_at': row[7],
-                    'word_count': row[8],
-                    'duration_minutes': row[9],
-                    'preview': truncate_text(row[2] or row[3], 150)
-                })
-            
-            return formatted_results
+            # Format rows as the cursor yields them, rather than materializing them first;
+            # the shared connection must stay locked until the cursor is drained
+            with self._lock:
+                return [
+                    {**dict(row), 'preview': truncate_text(row['original_text'] or row['rewritten_text'], 150)}
+                    for row in self._conn.execute(sql, params)
+                ]
             
         except Exception as e:
             print(f"Error searching content: {e}")
             return []
-        finally:
-            conn.close()
     
-    def _get_date_filter_condition(self, date_filter: str) -> Optional[str]:
-        """Get SQL condition for date filter."""
-        conditions = {
-            'today': "DATE(c.created_at) = DATE('now')",
-            'week': "c.created_at >= DATE('now', '-7 days')",
-            'month': "c.created_at >= DATE('now', '-30 days')",
-            'year': "c.created_at >= DATE('now', '-365 days')"
+    def _get_date_filter_condition(self, date_filter: str) -> Optional[Tuple[str, List[str]]]:
+        """Get SQL condition and parameters for date filter."""
+        # Only the date modifier varies, so every filter shares one SQL text
+        modifiers = {
+            'today': '+0 days',
+            'week': '-7 days',
+            'month': '-30 days',
+            'year': '-365 days'
         }
-        return conditions.get(date_filter.lower())
+        modifier = modifiers.get(date_filter.lower())
+        if modifier is None:
+            return None
+        return "c.created_at >= DATE('now', ?)", [modifier]
     
     def get_recent_content(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recently created content."""
-        return self.search_content("", limit=limit)
+        try:
+            # Straight to a static query; there is nothing to parse or filter
+            with self._lock:
+                return [
+                    {**dict(row), 'preview': truncate_text(row['original_text'] or row['rewritten_text'], 150)}
+                    for row in self._conn.execute(self._SQL_RECENT, (limit,))
+                ]
+            
+        except Exception as e:
+            print(f"Error getting recent content: {e}")
+            return []
     
     def get_content_by_id(self, content_id: int) -> Optional[Dict[str, Any]]:
         """Get content by ID."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._lock:
+                row = self._conn.execute('''
+                    SELECT id, title, original_text, rewritten_text, tone, voice,
+                           audio_path, created_at, word_count, duration_minutes
+                    FROM content 
+                    WHERE id = ?
+                ''', (content_id,)).fetchone()
             
-            cursor.execute('''
-                SELECT id, title, original_text, rewritten_text, tone, voice,
-                       audio_path, created_at, word_count, duration_minutes
-                FROM content 
-                WHERE id = ?
-            ''', (content_id,))
-            
-            row = cursor.fetchone()
-            if row:
-                return {
-                    'id': row[0],
-                    'title': row[1],
-                    'original_text': row[2],
-                    'rewritten_text': row[3],
-                    'tone': row[4],
-                    'voice': row[5],
-                    'audio_path': row[6],
-                    'created_at': row[7],
-                    'word_count': row[8],
-                    'duration_minutes': row[9]
-                }
-            return None
+            return dict(row) if row else None
             
         except Exception as e:
             print(f"Error getting content by ID: {e}")
             return None
-        finally:
-            conn.close()
     
     def delete_content(self, content_id: int) -> bool:
         """Delete content from index."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM search_index WHERE content_id = ?", (content_id,))
-            cursor.execute("DELETE FROM content WHERE id = ?", (content_id,))
+            with self._lock, self._conn:
+                cursor = self._conn.execute("DELETE FROM content WHERE id = ?", (content_id,))
             
-            conn.commit()
             return cursor.rowcount > 0
             
         except Exception as e:
             print(f"Error deleting content: {e}")
             return False
-        finally:
-            conn.close()
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get search engine statistics."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            stats = {}
-            
-            # Total content count
-            cursor.execute("SELECT COUNT(*) FROM content")
-            stats['total_content'] = cursor.fetchone()[0] or 0
-            
-            # Content by tone
-            cursor.execute("SELECT tone, COUNT(*) FROM content GROUP BY tone")
-            stats['content_by_tone'] = dict(cursor.fetchall())
-            
-            # Content by voice
-            cursor.execute("SELECT voice, COUNT(*) FROM content GROUP BY voice")
-            stats['content_by_voice'] = dict(cursor.fetchall())
-            
-            # Total words
-            cursor.execute("SELECT SUM(word_count) FROM content")
-            stats['total_words'] = cursor.fetchone()[0] or 0
-            
-            # Total duration
-            cursor.execute("SELECT SUM(duration_minutes) FROM content")
-            stats['total_duration_minutes'] = cursor.fetchone()[0] or 0.0
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                stats = {}
+                
+                # Total content count, words and duration in one scan
+                cursor.execute(self._SQL_TOTALS)
+                (stats['total_content'], stats['total_words'],
+                 stats['total_duration_minutes']) = cursor.fetchone()
+                
+                # Content by tone
+                cursor.execute(self._SQL_BY_TONE)
+                stats['content_by_tone'] = dict(cursor.fetchall())
+                
+                # Content by voice
+                cursor.execute(self._SQL_BY_VOICE)
+                stats['content_by_voice'] = dict(cursor.fetchall())
             
             return stats
             
@@ -399,15 +457,8 @@ class SearchEngine:
                 'content_by_tone': {},
                 'content_by_voice': {}
             }
-        finally:
-            conn.close()
-
-# Singleton instance
-_search_engine_instance = None
 
+@st.cache_resource
 def get_search_engine() -> SearchEngine:
     """Get singleton instance of SearchEngine."""
-    global _search_engine_instance
-    if _search_engine_instance is None:
-        _search_engine_instance = SearchEngine()
-    return _search_engine_instance
\ No newline at end of file
+    return SearchEngine()
\ No newline at end of file
@@ -1,22 +1,26 @@
 import streamlit as st
-import time
+
+# The browser cycles the emojis itself, so the script thread is never held up
+_SPEAKING_EMOJI_HTML = """
+<style>
+@keyframes speakingEmoji {
+    0% { content: "🗣️"; }
+    20% { content: "🎤"; }
+    40% { content: "📢"; }
+    60% { content: "🔊"; }
+    80% { content: "📣"; }
+}
+.speaking-emoji::before {
+    content: "🗣️";
+    animation: speakingEmoji 1.5s steps(1) infinite;
+}
+</style>
+<div class="speaking-emoji" style="font-size: 3rem; text-align: center;"></div>
+"""
 
 def speaking_emoji(is_speaking=False):
     """Display an animated speaking emoji."""
     if is_speaking:
-        # Create a placeholder for the emoji
-        emoji_placeholder = st.empty()
-        
-        # Animate the emoji
-        emojis = ["🗣️", "🎤", "📢", "🔊", "📣"]
-        while st.session_state.get('is_playing', False):
-            for emoji in emojis:
-                if not st.session_state.get('is_playing', False):
-                    break
-                emoji_placeholder.markdown(f'<div style="font-size: 3rem; text-align: center;">{emoji}</div>', unsafe_allow_html=True)
-                time.sleep(0.3)
-        
-        # Clear the placeholder when done
-        emoji_placeholder.empty()
+        st.markdown(_SPEAKING_EMOJI_HTML, unsafe_allow_html=True)
     else:
-        st.markdown('<div style="font-size: 3rem; text-align: center;">🎵</div>', unsafe_allow_html=True)
\ No newline at end of file
+        st.markdown('<div style="font-size: 3rem; text-align: center;">🎵</div>', unsafe_allow_html=True)
@@ -241,8 +241,7 @@ class TextProcessor:
             return original_text  # Fallback to original text
 
 
+@st.cache_resource
 def get_text_processor() -> TextProcessor:
     """Get singleton instance of TextProcessor."""
-    if 'text_processor' not in st.session_state:
-        st.session_state.text_processor = TextProcessor()
-    return st.session_state.text_processor
\ No newline at end of file
+    return TextProcessor()
\ No newline at end of file
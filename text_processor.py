@@ -2,13 +2,62 @@
 """Text processing module for tone adaptation using IBM Watsonx or Hugging Face."""
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import re
 import json
-import time
+import hashlib
 import streamlit as st
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
 from config import IBM_WATSONX_API_KEY, IBM_WATSONX_API_URL, IBM_WATSONX_PROJECT_ID, AVAILABLE_TONES
 from config import HUGGINGFACE_API_KEY, HUGGINGFACE_API_URL, HUGGINGFACE_MODELS, AI_SERVICE
 
+# Stripped, non-empty runs of text between periods, found in one C-level scan.
+# Matches start on a non-space, so no leading \s* can trade characters with
+# [^.]* and backtrack across long runs of whitespace.
+_SENTENCE_RE = re.compile(r'[^.\s](?:[^.]*[^.\s])?')
+
+# Tone prompts, longest first so a prompt that extends another is matched first
+_PROMPT_PREFIXES = tuple(sorted(
+    ((config["prompt"], name.lower()) for name, config in AVAILABLE_TONES.items()),
+    key=lambda item: len(item[0]), reverse=True
+))
+
+
+def _build_prompt(tone: str, text: str) -> str:
+    """
+    Build the rewrite prompt for a tone.
+    
+    The static tone instruction always comes first and the user text is a
+    strict suffix, so providers that cache prompt prefixes can reuse the
+    instruction across requests. Keep anything per-request out of the prefix.
+    """
+    return f"{AVAILABLE_TONES[tone]['prompt']}{text}"
+
+
+def _neutral_sentence(sentence: str) -> str:
+    """Make a sentence more formal and educational."""
+    if len(sentence) > 10:
+        sentence = f"It is important to understand that {sentence.lower()}"
+    if not sentence.endswith(('.', '!', '?')):
+        sentence += '.'
+    return sentence
+
+
+def _suspenseful_sentence(sentence: str) -> str:
+    """Add dramatic elements to a sentence."""
+    if len(sentence) > 15:
+        sentence = f"In the shadows of uncertainty, {sentence.lower()}"
+    return sentence + "... but what lies ahead remains a mystery."
+
+
+def _inspiring_sentence(sentence: str) -> str:
+    """Add motivational elements to a sentence."""
+    if len(sentence) > 12:
+        sentence = f"Believe in the power of {sentence.lower()}"
+    return sentence + "! This is your moment to shine."
+
 
 class TextProcessor:
     """Handles text rewriting with different tones using IBM Watsonx or Hugging Face."""
@@ -17,9 +66,22 @@ class TextProcessor:
         self.api_key = IBM_WATSONX_API_KEY if AI_SERVICE == "ibm" else HUGGINGFACE_API_KEY
         self.api_url = IBM_WATSONX_API_URL if AI_SERVICE == "ibm" else HUGGINGFACE_API_URL
         self.project_id = IBM_WATSONX_PROJECT_ID
+        # Part of the rewrite cache key, so changing credentials does not serve stale results
+        self._api_key_hash = hashlib.sha256((self.api_key or "").encode()).hexdigest()
         self.session = requests.Session()
+        # Keep a small pool of warm connections so repeated calls skip the TLS handshake;
+        # the adapter retries transient failures with exponential backoff
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
         
-    def _make_ibm_request(self, prompt: str, max_retries: int = 3) -> Optional[str]:
+    def _make_ibm_request(self, prompt: str) -> Optional[str]:
         """
         Make API request to IBM Watsonx.
         """
@@ -44,29 +106,26 @@ class TextProcessor:
             "project_id": self.project_id
         }
         
-        for attempt in range(max_retries):
-            try:
-                response = self.session.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=30
-                )
+        try:
+            response = self.session.post(
+                self.api_url,
+                headers=headers,
+                json=payload,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                return result.get("results", [{}])[0].get("generated_text", "").strip()
+            else:
+                print(f"IBM API request failed with status {response.status_code}: {response.text}")
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("results", [{}])[0].get("generated_text", "").strip()
-                else:
-                    print(f"IBM API request failed with status {response.status_code}: {response.text}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"IBM Request attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+        except requests.exceptions.RequestException as e:
+            print(f"IBM Request failed: {e}")
                     
         return None
     
-    def _make_huggingface_request(self, prompt: str, tone: str, max_retries: int = 3) -> Optional[str]:
+    def _make_huggingface_request(self, prompt: str, tone: str) -> Optional[str]:
         """
         Make API request to Hugging Face Inference API.
         """
@@ -94,49 +153,96 @@ class TextProcessor:
             }
         }
         
-        for attempt in range(max_retries):
-            try:
-                response = self.session.post(
-                    api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=30
-                )
+        try:
+            response = self.session.post(
+                api_url,
+                headers=headers,
+                json=payload,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                if isinstance(result, list) and len(result) > 0:
+                    return result[0].get("generated_text", "").strip()
+                elif isinstance(result, dict):
+                    return result.get("generated_text", "").strip()
+            else:
+                print(f"Hugging Face API request failed with status {response.status_code}: {response.text}")
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    if isinstance(result, list) and len(result) > 0:
-                        return result[0].get("generated_text", "").strip()
-                    elif isinstance(result, dict):
-                        return result.get("generated_text", "").strip()
-                else:
-                    print(f"Hugging Face API request failed with status {response.status_code}: {response.text}")
-                    # Fallback to simulation if API fails
-                    return self._simulate_ai_response(prompt)
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"Hugging Face Request attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                    
-        return self._simulate_ai_response(prompt)
+        except requests.exceptions.RequestException as e:
+            print(f"Hugging Face Request failed: {e}")
+        
+        # No simulated text here: a failure must reach _rewrite_uncached as None,
+        # so it raises and the fallback is not cached as the API result
+        return None
+    
+    def _make_huggingface_batch(self, prompts: List[str]) -> Optional[List[str]]:
+        """
+        Send several prompts to the Hugging Face Inference API in one request.
+        
+        Returns one generated text per prompt, or None if the batch failed.
+        """
+        if not self.api_key:
+            return None
+        
+        model = "microsoft/DialoGPT-medium"  # Same model as single requests
+        
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        # A list of inputs runs as one batched forward pass, with results in input order
+        payload = {
+            "inputs": prompts,
+            "parameters": {
+                "max_length": 500,
+                "temperature": 0.7,
+                "do_sample": True,
+                "return_full_text": False
+            }
+        }
+        
+        try:
+            response = self.session.post(
+                f"{self.api_url}/{model}",
+                headers=headers,
+                json=payload,
+                timeout=30
+            )
+            
+            if response.status_code != 200:
+                print(f"Hugging Face batch request failed with status {response.status_code}: {response.text}")
+                return None
+            
+            result = response.json()
+            if not isinstance(result, list) or len(result) != len(prompts):
+                return None
+            
+            texts = []
+            for item in result:
+                # Each entry may itself be a list of generations
+                if isinstance(item, list):
+                    item = item[0] if item else {}
+                texts.append(item.get("generated_text", "").strip() if isinstance(item, dict) else "")
+            return texts
+            
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Hugging Face batch request failed: {e}")
+            return None
     
     def _simulate_ai_response(self, prompt: str) -> str:
         """
         Simulate AI response for demo purposes.
         """
-        # Extract original text from prompt
+        # Determine tone and extract original text from prompt in one pass
         original_text = prompt
-        for tone_config in AVAILABLE_TONES.values():
-            if prompt.startswith(tone_config["prompt"]):
-                original_text = prompt[len(tone_config["prompt"]):].strip()
-                break
-        
-        # Determine tone from prompt
         tone = "neutral"
-        for tone_name, tone_config in AVAILABLE_TONES.items():
-            if prompt.startswith(tone_config["prompt"]):
-                tone = tone_name.lower()
+        for prefix, tone_name in _PROMPT_PREFIXES:
+            if prompt.startswith(prefix):
+                original_text = prompt[len(prefix):].strip()
+                tone = tone_name
                 break
         
         # Apply tone transformation
@@ -149,57 +255,23 @@ class TextProcessor:
     
     def _apply_neutral_tone(self, text: str) -> str:
         """Apply neutral tone transformation."""
-        sentences = text.split('.')
-        rewritten = []
-        
-        for sentence in sentences:
-            if sentence.strip():
-                clean_sentence = sentence.strip()
-                # Make it more formal and educational
-                if len(clean_sentence) > 10:
-                    clean_sentence = f"It is important to understand that {clean_sentence.lower()}"
-                if not clean_sentence.endswith(('.', '!', '?')):
-                    clean_sentence += '.'
-                rewritten.append(clean_sentence)
-        
-        return ' '.join(rewritten)
+        return ' '.join(map(_neutral_sentence, _SENTENCE_RE.findall(text)))
     
     def _apply_suspenseful_tone(self, text: str) -> str:
         """Apply suspenseful tone transformation."""
-        sentences = text.split('.')
-        rewritten = []
-        
-        for sentence in sentences:
-            if sentence.strip():
-                clean_sentence = sentence.strip()
-                # Add dramatic elements
-                if len(clean_sentence) > 15:
-                    clean_sentence = f"In the shadows of uncertainty, {clean_sentence.lower()}"
-                clean_sentence += "... but what lies ahead remains a mystery."
-                rewritten.append(clean_sentence)
-        
-        return ' '.join(rewritten)
+        return ' '.join(map(_suspenseful_sentence, _SENTENCE_RE.findall(text)))
     
     def _apply_inspiring_tone(self, text: str) -> str:
         """Apply inspiring tone transformation."""
-        sentences = text.split('.')
-        rewritten = []
-        
-        for sentence in sentences:
-            if sentence.strip():
-                clean_sentence = sentence.strip()
-                # Add motivational elements
-                if len(clean_sentence) > 12:
-                    clean_sentence = f"Believe in the power of {clean_sentence.lower()}"
-                clean_sentence += "! This is your moment to shine."
-                rewritten.append(clean_sentence)
-                
-        return ' '.join(rewritten)
+        return ' '.join(map(_inspiring_sentence, _SENTENCE_RE.findall(text)))
     
     def rewrite_text(self, original_text: str, tone: str) -> Optional[str]:
         """
         Rewrite text with specified tone using AI service.
         
+        Results are cached, so rewriting the same text in the same tone
+        again skips the API call.
+        
         Args:
             original_text: The original text to rewrite
             tone: The desired tone (Neutral, Suspenseful, Inspiring)
@@ -207,31 +279,78 @@ class TextProcessor:
         Returns:
             Rewritten text or None if processing failed
         """
+        return self._rewrite_with_source(original_text, tone)[0]
+    
+    def _rewrite_with_source(self, original_text: str, tone: str) -> Tuple[str, bool]:
+        """Rewrite text and report whether the result came from the AI service."""
         if tone not in AVAILABLE_TONES:
             raise ValueError(f"Invalid tone. Must be one of: {list(AVAILABLE_TONES.keys())}")
         
-        tone_config = AVAILABLE_TONES[tone]
-        prompt = f"{tone_config['prompt']}{original_text}"
-        
         try:
-            if AI_SERVICE == "ibm":
-                rewritten_text = self._make_ibm_request(prompt)
-            else:  # huggingface
-                rewritten_text = self._make_huggingface_request(prompt, tone)
-            
-            if rewritten_text:
-                # Clean up the response
-                rewritten_text = rewritten_text.replace("Original text:", "").strip()
-                if rewritten_text.startswith("Rewritten text:"):
-                    rewritten_text = rewritten_text.replace("Rewritten text:", "").strip()
-                
-                return rewritten_text if rewritten_text else original_text
-            else:
-                return original_text  # Fallback to original if API fails
+            rewritten_text = _cached_rewrite(self, original_text, tone, AI_SERVICE, self._api_key_hash)
+            # Without credentials the request methods simulate a rewrite
+            return rewritten_text, self._has_credentials()
                 
         except Exception as e:
             print(f"Error during text rewriting: {e}")
-            return original_text  # Fallback to original text
+            return original_text, False  # Fallback to original text
+    
+    def _has_credentials(self) -> bool:
+        """Whether the configured AI service can be called rather than simulated."""
+        if AI_SERVICE == "ibm":
+            return bool(self.api_key and self.api_url and self.project_id)
+        return bool(self.api_key)
+    
+    def rewrite_batch(self, texts: List[str], tone: str, max_workers: int = 8) -> List[str]:
+        """
+        Rewrite several texts with the same tone concurrently.
+        
+        Args:
+            texts: Texts to rewrite, e.g. the chapters of a book
+            tone: The desired tone (Neutral, Suspenseful, Inspiring)
+            max_workers: Maximum number of requests in flight at once
+            
+        Returns:
+            Rewritten texts, in the same order as the input
+        """
+        if tone not in AVAILABLE_TONES:
+            raise ValueError(f"Invalid tone. Must be one of: {list(AVAILABLE_TONES.keys())}")
+        if len(texts) <= 1:
+            return [self.rewrite_text(text, tone) for text in texts]
+        
+        if AI_SERVICE != "ibm":
+            # Hugging Face accepts all prompts in one request
+            responses = self._make_huggingface_batch([_build_prompt(tone, text) for text in texts])
+            if responses is not None:
+                return [self._clean_response(response) or text for response, text in zip(responses, texts)]
+        
+        # The requests are I/O bound, so threads overlap their round trips;
+        # max_workers matches the session's connection pool size
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as executor:
+            return list(executor.map(lambda text: self.rewrite_text(text, tone), texts))
+    
+    def _rewrite_uncached(self, original_text: str, tone: str) -> str:
+        """Rewrite text without consulting the cache; raises if the AI service returns nothing."""
+        prompt = _build_prompt(tone, original_text)
+        
+        if AI_SERVICE == "ibm":
+            rewritten_text = self._make_ibm_request(prompt)
+        else:  # huggingface
+            rewritten_text = self._make_huggingface_request(prompt, tone)
+        
+        if not rewritten_text:
+            # Raise rather than return, so a failed request is not cached
+            raise RuntimeError("AI service returned no text")
+        
+        return self._clean_response(rewritten_text) or original_text
+    
+    @staticmethod
+    def _clean_response(rewritten_text: str) -> str:
+        """Strip prompt echoes from a model response."""
+        rewritten_text = rewritten_text.replace("Original text:", "").strip()
+        if rewritten_text.startswith("Rewritten text:"):
+            rewritten_text = rewritten_text.replace("Rewritten text:", "").strip()
+        return rewritten_text
     
     def process_text(self, text: str, tone: str, language: str, auto_shorten: bool = True) -> Dict[str, Any]:
         """
@@ -249,11 +368,12 @@ class TextProcessor:
         try:
             # For now, we'll just rewrite the text without shortening
             # In a real implementation, you might add language-specific processing
-            rewritten_text = self.rewrite_text(text, tone)
+            rewritten_text, from_api = self._rewrite_with_source(text, tone)
             
             return {
                 'success': True,
                 'rewritten_text': rewritten_text,
+                'from_api': from_api,
                 'original_text': text,
                 'tone': tone,
                 'language': language
@@ -264,14 +384,21 @@ class TextProcessor:
                 'success': False,
                 'error': str(e),
                 'rewritten_text': text,  # Fallback to original text
+                'from_api': False,
                 'original_text': text,
                 'tone': tone,
                 'language': language
             }
 
 
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=512)
+def _cached_rewrite(_processor: TextProcessor, original_text: str, tone: str, service: str,
+                    api_key_hash: str) -> str:
+    """Cache rewrites per (text, tone, service, API key); the processor is not hashed."""
+    return _processor._rewrite_uncached(original_text, tone)
+
+
+@st.cache_resource
 def get_text_processor() -> TextProcessor:
     """Get singleton instance of TextProcessor."""
-    if 'text_processor' not in st.session_state:
-        st.session_state.text_processor = TextProcessor()
-    return st.session_state.text_processor
\ No newline at end of file
+    return TextProcessor()
\ No newline at end of file
@@ -1,12 +1,20 @@
 """Text-to-Speech engine for audio generation with text analysis and summarization."""
 
 import os
+import io
+import threading
+import shutil
+import hashlib
+import tempfile
 import streamlit as st
-from typing import Optional, Dict, Any
-from config import AVAILABLE_VOICES, AUDIO_DIR
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
+from config import AVAILABLE_VOICES, AUDIO_DIR, TTS_CACHE_DIR
 from utils import generate_filename
 from gtts import gTTS
 import re
+import heapq
+import itertools
 from collections import Counter
 
 # Try to import NLTK with fallback
@@ -38,6 +46,112 @@ except ImportError:
     print("NLTK not available, using fallback text processing methods")
 
 
+def _build_stopwords() -> frozenset:
+    """Get stopwords with fallback if NLTK is not available."""
+    if NLTK_AVAILABLE:
+        try:
+            return frozenset(stopwords.words('english'))
+        except:
+            pass
+    
+    # Fallback basic English stopwords
+    return frozenset({
+        'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 
+        'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', 
+        'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their', 
+        'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', 
+        'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 
+        'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 
+        'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of', 
+        'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into', 'through', 
+        'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down', 
+        'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 
+        'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 
+        'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 
+        'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'can', 
+        'will', 'just', 'should', 'now'
+    })
+
+
+def _load_sentence_tokenizer():
+    """Load the Punkt sentence tokenizer, or None if NLTK is not available."""
+    if not NLTK_AVAILABLE:
+        return None
+    try:
+        return nltk.data.load('tokenizers/punkt/english.pickle').tokenize
+    except:
+        # Newer NLTK releases ship Punkt without the pickle; sent_tokenize caches its own tokenizer
+        return sent_tokenize
+
+
+# Built once at import rather than per analyzer or per call
+# Sentence boundaries; the TTS splitter also breaks on blank-line paragraph gaps
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_TTS_SPLIT_RE = re.compile(r'\n{2,}|(?<=[.!?])\s+')
+_TTS_CHUNK_WORDS = 200
+_TTS_CACHE_MAX_FILES = 200
+_MAX_TTS_WORDS = 150
+# Words of three or more characters; the length filter runs inside the regex engine
+_WORD_RE = re.compile(r'\b\w{3,}\b')
+_STOPWORDS = _build_stopwords()
+_SENT_TOKENIZE = _load_sentence_tokenizer()
+
+
+def _split_for_tts(text: str) -> List[str]:
+    """Group paragraphs and sentences into chunks of about _TTS_CHUNK_WORDS words."""
+    chunks = []
+    current = []
+    current_words = 0
+    for piece in _TTS_SPLIT_RE.split(text):
+        piece = piece.strip()
+        if not piece:
+            continue
+        current.append(piece)
+        current_words += len(piece.split())
+        if current_words >= _TTS_CHUNK_WORDS:
+            chunks.append(' '.join(current))
+            current = []
+            current_words = 0
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+def _synthesize(text: str) -> bytes:
+    """Synthesize one chunk with gTTS and return the MP3 bytes."""
+    buffer = io.BytesIO()
+    gTTS(text=text, lang="en").write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+def _store_tts_cache(filepath: str, cache_path) -> None:
+    """Copy synthesized audio into the cache through a temp file, so readers never see a partial MP3."""
+    tmp_path = None
+    try:
+        os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=TTS_CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(filepath, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not cache synthesized audio: {e}")
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _prune_tts_cache(max_files: int = _TTS_CACHE_MAX_FILES) -> None:
+    """Drop the least recently used cached syntheses beyond max_files."""
+    try:
+        entries = sorted(TTS_CACHE_DIR.glob("*.mp3"), key=lambda p: p.stat().st_atime, reverse=True)
+        for path in entries[max_files:]:
+            path.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"TTS cache cleanup failed: {e}")
+
+
 class TextAnalyzer:
     """Handles text analysis and summarization."""
     
@@ -45,66 +159,56 @@ class TextAnalyzer:
         self.stop_words = self._get_stopwords()
     
     def _get_stopwords(self):
-        """Get stopwords with fallback if NLTK is not available."""
-        if NLTK_AVAILABLE:
+        """Get the shared stopword set."""
+        return _STOPWORDS
+    
+    def _tokenize_sentences(self, text: str) -> list:
+        """Split text into sentences; cached, since analysis and shortening tokenize the same text."""
+        return _cached_sentences(self, text)
+    
+    def _tokenize_sentences_uncached(self, text: str) -> list:
+        """Split text into sentences, with fallback if NLTK is not available."""
+        if _SENT_TOKENIZE is not None:
             try:
-                return set(stopwords.words('english'))
+                return _SENT_TOKENIZE(text)
             except:
                 pass
-        
-        # Fallback basic English stopwords
-        return {
-            'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 
-            'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', 
-            'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their', 
-            'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', 
-            'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 
-            'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 
-            'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of', 
-            'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into', 'through', 
-            'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down', 
-            'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 
-            'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 
-            'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 
-            'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'can', 
-            'will', 'just', 'should', 'now'
-        }
+        return self._simple_sent_tokenize(text)
     
     def _simple_sent_tokenize(self, text: str) -> list:
         """Simple sentence tokenizer fallback."""
-        # Split on common sentence endings
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        # Filter out empty strings
-        return [s.strip() for s in sentences if s.strip()]
+        # Split on common sentence endings, stripping each piece once
+        return [s for s in map(str.strip, _SENT_SPLIT_RE.split(text)) if s]
     
     def analyze_text(self, text: str) -> Dict[str, Any]:
         """
         Analyze the input text and provide statistics.
         
+        Results are cached, so Streamlit reruns with the same text skip the work.
+        
         Args:
             text: Input text to analyze
             
         Returns:
             Dictionary with analysis results
         """
+        return _cached_analysis(self, text)
+    
+    def _analyze_uncached(self, text: str) -> Dict[str, Any]:
+        """Analyze text without consulting the cache."""
         # Basic statistics
         char_count = len(text)
-        words = text.split()
-        word_count = len(words)
+        word_count = len(text.split())
         
         # Sentence count with fallback
-        if NLTK_AVAILABLE:
-            try:
-                sentence_count = len(sent_tokenize(text))
-            except:
-                sentence_count = len(self._simple_sent_tokenize(text))
-        else:
-            sentence_count = len(self._simple_sent_tokenize(text))
+        sentence_count = len(self._tokenize_sentences(text))
         
-        # Word frequency analysis
-        words_lower = re.findall(r'\b\w+\b', text.lower())
-        filtered_words = [word for word in words_lower if word not in self.stop_words and len(word) > 2]
-        word_freq = Counter(filtered_words)
+        # Word frequency analysis; lowercase each match rather than copying the whole text.
+        # The map chain and Counter's counting loop both run in C, so no bytecode runs per word;
+        # stopwords are dropped afterwards, once per distinct word instead of once per occurrence
+        word_freq = Counter(map(str.lower, map(re.Match.group, _WORD_RE.finditer(text))))
+        for word in self.stop_words & word_freq.keys():
+            del word_freq[word]
         common_words = word_freq.most_common(5)
         
         return {
@@ -132,13 +236,7 @@ class TextAnalyzer:
             return text
         
         # Tokenize into sentences with fallback
-        if NLTK_AVAILABLE:
-            try:
-                sentences = sent_tokenize(text)
-            except:
-                sentences = self._simple_sent_tokenize(text)
-        else:
-            sentences = self._simple_sent_tokenize(text)
+        sentences = self._tokenize_sentences(text)
         
         if len(sentences) <= max_sentences:
             # If text is already short, return as is
@@ -157,25 +255,23 @@ class TextAnalyzer:
         
         # Add middle sentences if needed, prioritizing longer ones
         if len(sentences) > 2 and len(key_sentences) < max_sentences:
-            middle_sentences = sentences[1:-1]
-            # Sort by length (longer sentences often contain more information)
-            middle_sentences.sort(key=len, reverse=True)
-            for sentence in middle_sentences:
-                if len(key_sentences) < max_sentences:
-                    key_sentences.append(sentence)
-                else:
-                    break
+            # Iterate the middle in place rather than slicing a copy of the list
+            middle_sentences = itertools.islice(sentences, 1, len(sentences) - 1)
+            # Take the longest ones (longer sentences often contain more information)
+            need = max_sentences - len(key_sentences)
+            key_sentences.extend(heapq.nlargest(need, middle_sentences, key=len))
         
         # Combine and limit word count
         shortened_text = ' '.join(key_sentences)
-        words = shortened_text.split()
+        # Stop splitting once we know the limit is exceeded
+        words = shortened_text.split(None, max_words)
         
         if len(words) > max_words:
             shortened_text = ' '.join(words[:max_words]) + '...'
         
         return shortened_text
     
-    def is_text_too_long(self, text: str, max_words: int = 150) -> bool:
+    def is_text_too_long(self, text: str, max_words: int = _MAX_TTS_WORDS) -> bool:
         """
         Check if text exceeds reasonable length for TTS.
         
@@ -186,7 +282,19 @@ class TextAnalyzer:
         Returns:
             Boolean indicating if text is too long
         """
-        return len(text.split()) > max_words
+        return len(text.split(None, max_words)) > max_words
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_analysis(_analyzer: TextAnalyzer, text: str) -> Dict[str, Any]:
+    """Cache analysis per text; the analyzer is not hashed."""
+    return _analyzer._analyze_uncached(text)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_sentences(_analyzer: TextAnalyzer, text: str) -> list:
+    """Cache sentence tokenization per text; the analyzer is not hashed."""
+    return _analyzer._tokenize_sentences_uncached(text)
 
 
 class TTSEngine:
@@ -195,6 +303,7 @@ class TTSEngine:
     def __init__(self):
         self.voices = AVAILABLE_VOICES
         self.analyzer = TextAnalyzer()
+        _prune_tts_cache()
         
     def generate_audio(self, text: str, voice: str, tone: str, 
                       auto_shorten: bool = True, podcast_mode: bool = False) -> Dict[str, Any]:
@@ -222,13 +331,15 @@ class TTSEngine:
             processed_text = text
             was_shortened = False
             
-            if auto_shorten and self.analyzer.is_text_too_long(text):
+            # Reuse the word count from the analysis instead of splitting the text again
+            original_word_count = analysis['word_count']
+            if auto_shorten and original_word_count > _MAX_TTS_WORDS:
                 processed_text = self.analyzer.shorten_text(text)
                 was_shortened = True
                 # Re-analyze shortened text
                 analysis = self.analyzer.analyze_text(processed_text)
                 analysis['was_shortened'] = was_shortened
-                analysis['original_word_count'] = len(text.split())
+                analysis['original_word_count'] = original_word_count
             
             # Generate audio
             audio_path = self._generate_audio_file(processed_text, voice, tone)
@@ -275,6 +386,29 @@ class TTSEngine:
                 'error': str(e)
             }
     
+    def generate_audio_batch(self, chunks: List[str], voice: str, tone: str,
+                             max_workers: int = 4) -> List[str]:
+        """
+        Generate audio files for several text chunks concurrently.
+        
+        Args:
+            chunks: Texts to convert, e.g. the chapters of a book
+            voice: Voice name
+            tone: Tone used
+            max_workers: Maximum number of gTTS requests in flight at once
+            
+        Returns:
+            Paths to the generated audio files, in the same order as the chunks
+        """
+        if voice not in self.voices:
+            raise ValueError(f"Invalid voice. Must be one of: {list(self.voices.keys())}")
+        if not chunks:
+            return []
+        
+        # gTTS blocks on network I/O, so threads let the requests overlap
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            return list(executor.map(lambda chunk: self._generate_audio_file(chunk, voice, tone), chunks))
+    
     def get_voice_info(self, voice: str) -> Dict[str, Any]:
         """
         Get information about a specific voice.
@@ -305,20 +439,51 @@ class TTSEngine:
         
         # Ensure directory exists
         os.makedirs(AUDIO_DIR, exist_ok=True)
-
-        # Generate and save speech
-        tts = gTTS(text=text, lang="en")
-        tts.save(filepath)
+        
+        # Identical text synthesizes to identical audio, so reuse an earlier result
+        key = hashlib.sha256(f"{text}|{voice}|en".encode()).hexdigest()
+        cache_path = TTS_CACHE_DIR / f"{key}.mp3"
+        if cache_path.exists():
+            try:
+                shutil.copyfile(cache_path, filepath)
+                return filepath
+            except OSError:
+                pass  # Pruned in the meantime; synthesize again
+        
+        self._synthesize_to(text, filepath)
+        _store_tts_cache(filepath, cache_path)
+        _prune_tts_cache()
         
         return filepath
+    
+    def _synthesize_to(self, text: str, filepath: str) -> None:
+        """Synthesize text with gTTS into filepath."""
+        chunks = _split_for_tts(text)
+        if len(chunks) <= 1:
+            # Generate and save speech
+            tts = gTTS(text=text, lang="en")
+            tts.save(filepath)
+            return
+        
+        # gTTS requests its own pieces one at a time, so synthesize the chunks in
+        # parallel; MP3 frames can be concatenated as-is
+        with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as executor:
+            parts = list(executor.map(_synthesize, chunks))
+        
+        with open(filepath, 'wb') as f:
+            f.write(b''.join(parts))
 
 
 # Singleton instance
 _tts_engine_instance = None
+_tts_engine_lock = threading.Lock()
 
 def get_tts_engine() -> TTSEngine:
     """Get singleton instance of TTSEngine."""
     global _tts_engine_instance
+    # Double-checked so concurrent sessions never build two engines, without locking once built
     if _tts_engine_instance is None:
-        _tts_engine_instance = TTSEngine()
-    return _tts_engine_instance
\ No newline at end of file
+        with _tts_engine_lock:
+            if _tts_engine_instance is None:
+                _tts_engine_instance = TTSEngine()
+    return _tts_engine_instance
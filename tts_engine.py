@@ -2,13 +2,20 @@
 """Text-to-Speech engine for audio generation with text analysis and summarization."""
 
 import os
+import io
+import wave
+import threading
 import streamlit as st
 import time  # Added missing import
-from typing import Optional, Dict, Any
-from config import AVAILABLE_VOICES, AUDIO_DIR, SUPPORTED_LANGUAGES
-from utils import generate_filename
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, List, Tuple
+from config import AVAILABLE_VOICES, VOICE_NAMES_BY_LANG, VOICE_RECORD, AUDIO_DIR, SUPPORTED_LANGUAGES
+from config import IBM_TTS_API_KEY, PIPER_MODELS_DIR
+from utils import generate_filename, create_podcast_audio
 from gtts import gTTS
 import re
+import math
+import heapq
 from collections import Counter
 from search_engine import get_search_engine
 
@@ -21,34 +28,98 @@ try:
 except ImportError:
     IBM_TTS_AVAILABLE = False
 
+# Try to import Piper for local synthesis; its WAV output is converted to MP3 with pydub
+try:
+    from piper.voice import PiperVoice
+    from pydub import AudioSegment
+    from config import PIPER_MODELS_DIR
+    PIPER_AVAILABLE = bool(PIPER_MODELS_DIR)
+except ImportError:
+    PIPER_AVAILABLE = False
+
+# Prefer blingfire's compiled sentence splitter when it is installed
+try:
+    import blingfire
+    BLINGFIRE_AVAILABLE = True
+except ImportError:
+    BLINGFIRE_AVAILABLE = False
+
 # Try to import NLTK with fallback
 try:
     import nltk
     from nltk.tokenize import sent_tokenize
     from nltk.corpus import stopwords
-    
-    # Download required NLTK data with error handling
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        try:
-            nltk.download('punkt', quiet=True)
-        except:
-            print("NLTK punkt download failed, using fallback tokenizer")
-    
-    try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        try:
-            nltk.download('stopwords', quiet=True)
-        except:
-            print("NLTK stopwords download failed, using fallback stopwords")
-    
     NLTK_AVAILABLE = True
 except ImportError:
     NLTK_AVAILABLE = False
     print("NLTK not available, using fallback text processing methods")
 
+# Compiled once at import rather than looked up in the re cache on every call
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+# Target size of each concurrently synthesized piece of a long text
+_TTS_CHUNK_WORDS = 60
+_TTS_MAX_WORKERS = 4
+_MAX_TTS_WORDS = 150
+# Words of three or more characters; the length filter runs inside the regex engine
+_WORD_RE = re.compile(r'\b\w{3,}\b')
+
+
+# NLTK data is probed (and downloaded if missing) on first use, not at import
+_nltk_data_ready = {}
+
+
+def _ensure_nltk_data(resource: str, package: str) -> bool:
+    """Make sure an NLTK data package is present; checked once per process."""
+    if package not in _nltk_data_ready:
+        try:
+            nltk.data.find(resource)
+            _nltk_data_ready[package] = True
+        except LookupError:
+            try:
+                _nltk_data_ready[package] = bool(nltk.download(package, quiet=True))
+            except:
+                print(f"NLTK {package} download failed, using fallback")
+                _nltk_data_ready[package] = False
+    return _nltk_data_ready[package]
+
+
+def _build_stopwords() -> frozenset:
+    """Get stopwords with fallback if NLTK is not available."""
+    if NLTK_AVAILABLE and _ensure_nltk_data('corpora/stopwords', 'stopwords'):
+        try:
+            return frozenset(stopwords.words('english'))
+        except:
+            pass
+    
+    # Fallback basic English stopwords
+    return frozenset({
+        'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 
+        'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', 
+        'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their', 
+        'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', 
+        'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 
+        'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 
+        'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of', 
+        'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into', 'through', 
+        'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down', 
+        'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 
+        'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 
+        'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 
+        'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'can', 
+        'will', 'just', 'should', 'now'
+    })
+
+
+_STOPWORDS = None
+
+
+def _get_shared_stopwords() -> frozenset:
+    """Build the stopword set on first use and share it across analyzers."""
+    global _STOPWORDS
+    if _STOPWORDS is None:
+        _STOPWORDS = _build_stopwords()
+    return _STOPWORDS
+
 
 class TextAnalyzer:
     """Handles text analysis and summarization."""
@@ -57,35 +128,31 @@ class TextAnalyzer:
         self.stop_words = self._get_stopwords()
     
     def _get_stopwords(self):
-        """Get stopwords with fallback if NLTK is not available."""
-        if NLTK_AVAILABLE:
+        """Get the shared stopword set."""
+        return _get_shared_stopwords()
+    
+    def _sent_tokenize(self, text: str) -> list:
+        """Split text into sentences; cached, since analysis, shortening and chunking share it."""
+        return _cached_sentences(self, text)
+    
+    def _sent_tokenize_uncached(self, text: str) -> list:
+        """Split text into sentences with the fastest available tokenizer."""
+        if BLINGFIRE_AVAILABLE:
             try:
-                return set(stopwords.words('english'))
+                return [s for s in blingfire.text_to_sentences(text).split('\n') if s]
             except:
                 pass
-        
-        # Fallback basic English stopwords
-        return {
-            'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 
-            'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', 
-            'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their', 
-            'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', 
-            'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 
-            'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 
-            'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of', 
-            'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into', 'through', 
-            'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down', 
-            'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 
-            'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 
-            'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 
-            'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'can', 
-            'will', 'just', 'should', 'now'
-        }
+        if NLTK_AVAILABLE and _ensure_nltk_data('tokenizers/punkt', 'punkt'):
+            try:
+                return sent_tokenize(text)
+            except:
+                pass
+        return self._simple_sent_tokenize(text)
     
     def _simple_sent_tokenize(self, text: str) -> list:
         """Simple sentence tokenizer fallback."""
         # Split on common sentence endings
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = _SENT_SPLIT_RE.split(text)
         # Filter out empty strings
         return [s.strip() for s in sentences if s.strip()]
     
@@ -93,30 +160,30 @@ class TextAnalyzer:
         """
         Analyze the input text and provide statistics.
         
+        Results are cached, so Streamlit reruns with the same text skip the work.
+        
         Args:
             text: Input text to analyze
             
         Returns:
             Dictionary with analysis results
         """
+        return _cached_analysis(self, text)
+    
+    def _analyze_uncached(self, text: str) -> Dict[str, Any]:
+        """Analyze text without consulting the cache."""
         # Basic statistics
         char_count = len(text)
-        words = text.split()
-        word_count = len(words)
+        word_count = len(text.split())
         
         # Sentence count with fallback
-        if NLTK_AVAILABLE:
-            try:
-                sentence_count = len(sent_tokenize(text))
-            except:
-                sentence_count = len(self._simple_sent_tokenize(text))
-        else:
-            sentence_count = len(self._simple_sent_tokenize(text))
+        sentence_count = len(self._sent_tokenize(text))
         
-        # Word frequency analysis
-        words_lower = re.findall(r'\b\w+\b', text.lower())
-        filtered_words = [word for word in words_lower if word not in self.stop_words and len(word) > 2]
-        word_freq = Counter(filtered_words)
+        # Word frequency analysis in one streaming pass: match, lowercase and count in C,
+        # then drop stopwords once per distinct word instead of once per occurrence
+        word_freq = Counter(map(str.lower, map(re.Match.group, _WORD_RE.finditer(text))))
+        for word in self.stop_words & word_freq.keys():
+            del word_freq[word]
         common_words = word_freq.most_common(5)
         
         return {
@@ -132,6 +199,8 @@ class TextAnalyzer:
         """
         Shorten text by extracting key sentences.
         
+        Results are cached per text and limits.
+        
         Args:
             text: Input text to shorten
             max_sentences: Maximum number of sentences to keep
@@ -140,43 +209,45 @@ class TextAnalyzer:
         Returns:
             Shortened version of the text
         """
+        return _cached_shortened(self, text, max_sentences, max_words)
+    
+    def _shorten_uncached(self, text: str, max_sentences: int, max_words: int) -> str:
+        """Shorten text without consulting the cache."""
         if not text.strip():
             return text
         
         # Tokenize into sentences with fallback
-        if NLTK_AVAILABLE:
-            try:
-                sentences = sent_tokenize(text)
-            except:
-                sentences = self._simple_sent_tokenize(text)
-        else:
-            sentences = self._simple_sent_tokenize(text)
+        sentences = self._sent_tokenize(text)
         
         if len(sentences) <= max_sentences:
             # If text is already short, return as is
             return text
         
-        # Simple summarization: take first and last sentences
-        key_sentences = []
-        
-        # Add first sentence (usually contains main idea)
-        if sentences:
-            key_sentences.append(sentences[0])
-        
-        # Add last sentence (often contains conclusion)
-        if len(sentences) > 1:
-            key_sentences.append(sentences[-1])
-        
-        # Add middle sentences if needed, prioritizing longer ones
-        if len(sentences) > 2 and len(key_sentences) < max_sentences:
-            middle_sentences = sentences[1:-1]
-            # Sort by length (longer sentences often contain more information)
-            middle_sentences.sort(key=len, reverse=True)
-            for sentence in middle_sentences:
-                if len(key_sentences) < max_sentences:
-                    key_sentences.append(sentence)
-                else:
-                    break
+        if len(sentences) >= 5:
+            # Enough sentences for term weights to mean something
+            key_sentences = self._top_sentences_tfidf(sentences, max_sentences)
+        else:
+            # Simple summarization: take first and last sentences
+            key_sentences = []
+            
+            # Add first sentence (usually contains main idea)
+            if sentences:
+                key_sentences.append(sentences[0])
+            
+            # Add last sentence (often contains conclusion)
+            if len(sentences) > 1:
+                key_sentences.append(sentences[-1])
+            
+            # Add middle sentences if needed, prioritizing longer ones
+            if len(sentences) > 2 and len(key_sentences) < max_sentences:
+                middle_sentences = sentences[1:-1]
+                # Sort by length (longer sentences often contain more information)
+                middle_sentences.sort(key=len, reverse=True)
+                for sentence in middle_sentences:
+                    if len(key_sentences) < max_sentences:
+                        key_sentences.append(sentence)
+                    else:
+                        break
         
         # Combine and limit word count
         shortened_text = ' '.join(key_sentences)
@@ -187,7 +258,30 @@ class TextAnalyzer:
         
         return shortened_text
     
-    def is_text_too_long(self, text: str, max_words: int = 150) -> bool:
+    def _top_sentences_tfidf(self, sentences: List[str], count: int) -> List[str]:
+        """
+        Pick the sentences with the highest TF-IDF weight, in their original order.
+        
+        Each sentence is treated as a document: its score is the sum of
+        tf * idf over its non-stopword terms, with idf = log(N / (1 + df)).
+        """
+        sentence_terms = [
+            Counter(word for word in map(str.lower, _WORD_RE.findall(sentence)) if word not in self.stop_words)
+            for sentence in sentences
+        ]
+        
+        document_freq = Counter()
+        for terms in sentence_terms:
+            document_freq.update(terms.keys())
+        
+        total = len(sentences)
+        idf = {term: math.log(total / (1 + df)) for term, df in document_freq.items()}
+        scores = [sum(tf * idf[term] for term, tf in terms.items()) for terms in sentence_terms]
+        
+        top = heapq.nlargest(count, range(total), key=scores.__getitem__)
+        return [sentences[i] for i in sorted(top)]
+    
+    def is_text_too_long(self, text: str, max_words: int = _MAX_TTS_WORDS) -> bool:
         """
         Check if text exceeds reasonable length for TTS.
         
@@ -198,7 +292,25 @@ class TextAnalyzer:
         Returns:
             Boolean indicating if text is too long
         """
-        return len(text.split()) > max_words
+        return len(text.split(None, max_words)) > max_words
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_analysis(_analyzer: TextAnalyzer, text: str) -> Dict[str, Any]:
+    """Cache analysis per text; the analyzer is not hashed."""
+    return _analyzer._analyze_uncached(text)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_sentences(_analyzer: TextAnalyzer, text: str) -> list:
+    """Cache sentence tokenization per text; the analyzer is not hashed."""
+    return _analyzer._sent_tokenize_uncached(text)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_shortened(_analyzer: TextAnalyzer, text: str, max_sentences: int, max_words: int) -> str:
+    """Cache shortened text per (text, limits); the analyzer is not hashed."""
+    return _analyzer._shorten_uncached(text, max_sentences, max_words)
 
 
 class TTSEngine:
@@ -208,6 +320,10 @@ class TTSEngine:
         self.voices = AVAILABLE_VOICES
         self.analyzer = TextAnalyzer()
         
+        # Loaded Piper voices by language code, so each ONNX model loads once
+        self._piper_voices = {}
+        self._piper_lock = threading.Lock()
+        
         # Initialize IBM Watson TTS if available
         self.ibm_tts = None
         if IBM_TTS_AVAILABLE:
@@ -220,7 +336,8 @@ class TTSEngine:
                 self.ibm_tts = None
     
     def generate_audio(self, text: str, voice: str, tone: str, language: str,
-                      auto_shorten: bool = True, podcast_mode: bool = False) -> Dict[str, Any]:
+                      auto_shorten: bool = True, podcast_mode: bool = False,
+                      stream_sentences: bool = True) -> Dict[str, Any]:
         """
         Generate audio from text with optional text shortening.
         
@@ -231,18 +348,19 @@ class TTSEngine:
             language: Selected language
             auto_shorten: Whether to automatically shorten long text
             podcast_mode: Whether to apply podcast enhancements
+            stream_sentences: Whether to synthesize groups of sentences concurrently
             
         Returns:
             Dictionary containing audio path and analysis results
         """
-        # Get available voices for the selected language
-        language_voices = self.voices.get(language, self.voices["English"])
-        
-        if voice not in language_voices:
-            # Fallback to default voice for the language
-            voice = list(language_voices.keys())[0]
+        # Fallback to the default voice for the language
+        voice, _ = self._resolve_voice(voice, language)
         
         try:
+            # Split once; the count and title below reuse it
+            words = text.split()
+            word_count = len(words)
+            
             # Analyze the input text
             analysis = self.analyzer.analyze_text(text)
             
@@ -250,21 +368,27 @@ class TTSEngine:
             processed_text = text
             was_shortened = False
             
-            if auto_shorten and self.analyzer.is_text_too_long(text):
+            if auto_shorten and word_count > _MAX_TTS_WORDS:
                 processed_text = self.analyzer.shorten_text(text)
                 was_shortened = True
-                # Re-analyze shortened text
-                analysis = self.analyzer.analyze_text(processed_text)
-                analysis['was_shortened'] = was_shortened
-                analysis['original_word_count'] = len(text.split())
+                # Refresh only the counts for the shortened text; the common words of
+                # the full text are more representative, so keep them
+                shortened_word_count = len(processed_text.split())
+                analysis.update({
+                    'char_count': len(processed_text),
+                    'word_count': shortened_word_count,
+                    'sentence_count': len(self.analyzer._sent_tokenize(processed_text)),
+                    'reading_time_minutes': round(shortened_word_count / 200, 1),  # 200 words per minute
+                    'was_shortened': was_shortened,
+                    'original_word_count': word_count
+                })
             
             # Generate audio
-            audio_path = self._generate_audio_file(processed_text, voice, tone, language)
+            audio_path, tts_backend = self._generate_audio_file(processed_text, voice, tone, language, stream_sentences)
             
             # Apply podcast enhancements if requested
             if podcast_mode:
                 try:
-                    from utils import create_podcast_audio
                     audio_path = create_podcast_audio(audio_path, processed_text, tone, voice)
                     analysis['podcast_enhanced'] = True
                 except Exception as e:
@@ -277,8 +401,7 @@ class TTSEngine:
             try:
                 search_engine = get_search_engine()
                 # Use the first few words as title
-                title_words = text.split()[:5]
-                title = " ".join(title_words) + ("..." if len(text.split()) > 5 else "")
+                title = " ".join(words[:5]) + ("..." if word_count > 5 else "")
                 
                 search_engine.index_content(
                     title=title,
@@ -297,6 +420,9 @@ class TTSEngine:
                 'audio_path': audio_path,
                 'processed_text': processed_text,
                 'analysis': analysis,
+                'tts_backend': tts_backend,
+                # True when the configured backend failed or is missing and a fallback spoke instead
+                'tts_fallback': tts_backend != self._configured_backend(),
                 'success': True
             }
             
@@ -334,10 +460,29 @@ class TTSEngine:
         Returns:
             Voice configuration dictionary
         """
-        language_voices = self.voices.get(language, self.voices["English"])
-        return language_voices.get(voice, {})
+        if language not in VOICE_NAMES_BY_LANG:
+            language = "English"
+        return VOICE_RECORD.get((language, voice), {})
+    
+    def _resolve_voice(self, voice: str, language: str):
+        """Return (voice, config), falling back to English and the language's first voice."""
+        if language not in VOICE_NAMES_BY_LANG:
+            language = "English"
+        if (language, voice) not in VOICE_RECORD:
+            voice = VOICE_NAMES_BY_LANG[language][0]
+        return voice, VOICE_RECORD[(language, voice)]
+    
+    @staticmethod
+    def _configured_backend() -> str:
+        """The TTS backend the configuration asks for, whether or not it is usable."""
+        if IBM_TTS_API_KEY:
+            return "ibm"
+        if PIPER_MODELS_DIR:
+            return "piper"
+        return "gtts"
     
-    def _generate_audio_file(self, text: str, voice: str, tone: str, language: str) -> str:
+    def _generate_audio_file(self, text: str, voice: str, tone: str, language: str,
+                             stream_sentences: bool = True) -> Tuple[str, str]:
         """
         Generate audio using IBM Watson TTS or fallback to gTTS.
         
@@ -346,9 +491,10 @@ class TTSEngine:
             voice: Selected voice
             tone: Selected tone
             language: Selected language
+            stream_sentences: Whether to synthesize groups of sentences concurrently
             
         Returns:
-            Path to generated audio file
+            Tuple of (path to generated audio file, backend used: "ibm", "piper" or "gtts")
         """
         # Generate filename
         filename = generate_filename("audiobook", tone, voice, ".mp3")
@@ -356,29 +502,135 @@ class TTSEngine:
         
         # Ensure directory exists
         os.makedirs(AUDIO_DIR, exist_ok=True)
+        
+        chunks = self._chunk_text(text) if stream_sentences else [text]
 
         # Try to use IBM Watson TTS if available
         if self.ibm_tts:
             try:
-                language_voices = self.voices.get(language, self.voices["English"])
-                voice_config = language_voices.get(voice, list(language_voices.values())[0])
-                voice_code = voice_config["voice"]
+                voice_code = self._resolve_voice(voice, language)[1]["voice"]
+                
+                if len(chunks) > 1:
+                    return self._generate_audio_file_parallel(
+                        chunks, lambda chunk: self._synthesize_ibm(chunk, voice_code), filepath
+                    ), "ibm"
                 
-                # Generate audio with IBM Watson TTS
+                # Generate audio with IBM Watson TTS, streaming it to disk as it arrives
+                response = self.ibm_tts.synthesize(
+                    text,
+                    voice=voice_code,
+                    accept='audio/mp3',
+                    stream=True
+                ).get_result()
                 with open(filepath, 'wb') as audio_file:
-                    response = self.ibm_tts.synthesize(
-                        text,
-                        voice=voice_code,
-                        accept='audio/mp3'
-                    ).get_result()
-                    audio_file.write(response.content)
+                    for chunk in response.iter_content(chunk_size=8192):
+                        audio_file.write(chunk)
                 
-                return filepath
+                return filepath, "ibm"
             except Exception as e:
                 print(f"IBM TTS failed, falling back to gTTS: {e}")
         
+        # Local synthesis avoids the network round trip when a model is installed
+        if PIPER_AVAILABLE:
+            try:
+                piper_path = self._generate_audio_with_piper(text, language, filepath)
+                if piper_path:
+                    return piper_path, "piper"
+            except Exception as e:
+                print(f"Piper TTS failed, falling back to gTTS: {e}")
+        
         # Fallback to gTTS
-        return self._generate_audio_with_gtts(text, voice, language, filepath)
+        if len(chunks) > 1:
+            lang_code = SUPPORTED_LANGUAGES.get(language, {}).get("code", "en")
+            return self._generate_audio_file_parallel(
+                chunks, lambda chunk: self._synthesize_gtts(chunk, lang_code), filepath
+            ), "gtts"
+        return self._generate_audio_with_gtts(text, voice, language, filepath), "gtts"
+    
+    def _load_piper_voice(self, lang_code: str):
+        """Load the Piper voice for a language code, or None if no model is installed."""
+        with self._piper_lock:
+            if lang_code not in self._piper_voices:
+                model_path = os.path.join(PIPER_MODELS_DIR, f"{lang_code}.onnx")
+                self._piper_voices[lang_code] = PiperVoice.load(model_path) if os.path.exists(model_path) else None
+            return self._piper_voices[lang_code]
+    
+    def _generate_audio_with_piper(self, text: str, language: str, filepath: str) -> Optional[str]:
+        """
+        Generate audio locally with Piper.
+        
+        Args:
+            text: Text to convert
+            language: Selected language
+            filepath: Path to save the audio file
+            
+        Returns:
+            Path to generated audio file, or None if no model exists for the language
+        """
+        lang_code = SUPPORTED_LANGUAGES.get(language, {}).get("code", "en")
+        voice = self._load_piper_voice(lang_code)
+        if voice is None:
+            return None
+        
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav_file:
+            # piper-tts renamed synthesize to synthesize_wav in newer releases
+            synthesize_wav = getattr(voice, "synthesize_wav", None) or voice.synthesize
+            synthesize_wav(text, wav_file)
+        buffer.seek(0)
+        
+        AudioSegment.from_wav(buffer).export(filepath, format="mp3")
+        return filepath
+    
+    def _chunk_text(self, text: str) -> List[str]:
+        """Group sentences into pieces of about _TTS_CHUNK_WORDS words for concurrent synthesis."""
+        chunks = []
+        current = []
+        current_words = 0
+        for sentence in self.analyzer._sent_tokenize(text):
+            current.append(sentence)
+            current_words += len(sentence.split())
+            if current_words >= _TTS_CHUNK_WORDS:
+                chunks.append(' '.join(current))
+                current = []
+                current_words = 0
+        if current:
+            chunks.append(' '.join(current))
+        return chunks or [text]
+    
+    def _synthesize_ibm(self, text: str, voice_code: str) -> bytes:
+        """Synthesize one piece of text with IBM Watson TTS and return the MP3 bytes."""
+        return self.ibm_tts.synthesize(text, voice=voice_code, accept='audio/mp3').get_result().content
+    
+    def _synthesize_gtts(self, text: str, lang_code: str) -> bytes:
+        """Synthesize one piece of text with gTTS and return the MP3 bytes."""
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang_code, slow=False).write_to_fp(buffer)
+        return buffer.getvalue()
+    
+    def _generate_audio_file_parallel(self, chunks: List[str], synthesize: Callable[[str], bytes],
+                                      filepath: str) -> str:
+        """
+        Synthesize chunks concurrently and write them to filepath in order.
+        
+        Args:
+            chunks: Pieces of text, in reading order
+            synthesize: Function returning the MP3 bytes for one piece
+            filepath: Path to save the audio file
+            
+        Returns:
+            Path to generated audio file
+        """
+        # Each synthesis is a blocking network call, so threads overlap them;
+        # MP3 frames can be concatenated as-is
+        with ThreadPoolExecutor(max_workers=min(_TTS_MAX_WORKERS, len(chunks))) as executor:
+            parts = list(executor.map(synthesize, chunks))
+        
+        with open(filepath, 'wb') as audio_file:
+            for part in parts:
+                audio_file.write(part)
+        
+        return filepath
     
     def _generate_audio_with_gtts(self, text: str, voice: str, language: str, filepath: str) -> str:
         """
@@ -404,12 +656,7 @@ class TTSEngine:
         return filepath
 
 
-# Singleton instance
-_tts_engine_instance = None
-
+@st.cache_resource
 def get_tts_engine() -> TTSEngine:
     """Get singleton instance of TTSEngine."""
-    global _tts_engine_instance
-    if _tts_engine_instance is None:
-        _tts_engine_instance = TTSEngine()
-    return _tts_engine_instance
\ No newline at end of file
+    return TTSEngine()
\ No newline at end of file
@@ -218,22 +218,37 @@ def apply_audio_enhancements(audio_segment):
     return audio_segment
 
 
+def _load_music(path, default_duration):
+    """Decode a music file, falling back to silence when it is missing."""
+    from pydub import AudioSegment
+    
+    if os.path.isfile(path):
+        return AudioSegment.from_mp3(path)
+    return AudioSegment.silent(duration=default_duration)
+
+
+@st.cache_resource
+def _load_intro():
+    """Load the intro music once per process."""
+    return _load_music(PODCAST_SETTINGS["intro_music"], 3000)  # Default silent intro
+
+
+@st.cache_resource
+def _load_outro():
+    """Load the outro music once per process."""
+    return _load_music(PODCAST_SETTINGS["outro_music"], 2000)  # Default silent outro
+
+
 def add_music_intro_outro(audio_segment):
     """
     Add intro and outro music to audio.
     """
-    from pydub import AudioSegment
-    
     try:
-        # Try to load intro music
-        intro_music = AudioSegment.silent(duration=3000)  # Default silent intro
-        
         # Add intro music with fade in
-        final_audio = intro_music.append(audio_segment, crossfade=1500)
+        final_audio = _load_intro().append(audio_segment, crossfade=1500)
         
         # Add outro music with fade out
-        outro_music = AudioSegment.silent(duration=2000)  # Default silent outro
-        final_audio = final_audio.append(outro_music, crossfade=1500)
+        final_audio = final_audio.append(_load_outro(), crossfade=1500)
         
         return final_audio
         
@@ -259,16 +274,27 @@ def add_chapter_markers(audio_segment, text):
         chapter_interval = 5 * 60 * 1000  # 5 minutes in milliseconds
         
         if segment_length > chapter_interval:
-            final_audio = AudioSegment.empty()
-            position = 0
+            divider = silence + chapter_marker + silence
+            
+            # Bring both to one format so raw frames can be joined in a single
+            # pass instead of re-copying the growing segment on every +=
+            frame_rate = max(audio_segment.frame_rate, divider.frame_rate)
+            channels = max(audio_segment.channels, divider.channels)
+            sample_width = max(audio_segment.sample_width, divider.sample_width)
+            audio_segment = audio_segment.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(sample_width)
+            divider_data = divider.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(sample_width).raw_data
             
-            while position < segment_length:
-                chunk = audio_segment[position:position + chapter_interval]
-                final_audio += chunk
-                final_audio += silence + chapter_marker + silence
-                position += chapter_interval
+            parts = []
+            for position in range(0, segment_length, chapter_interval):
+                parts.append(audio_segment[position:position + chapter_interval].raw_data)
+                parts.append(divider_data)
             
-            return final_audio
+            return AudioSegment(
+                data=b"".join(parts),
+                sample_width=sample_width,
+                frame_rate=frame_rate,
+                channels=channels,
+            )
             
     except Exception as e:
         print(f"Error adding chapter markers: {e}")
@@ -3,19 +3,44 @@
 
 import os
 import re
-import uuid
+import time
+import functools
 import streamlit as st
-from typing import Optional
-from config import TEMP_DIR, AUDIO_DIR, ASSETS_DIR, SUPPORTED_FILE_TYPES, MAX_TEXT_LENGTH
+from typing import Optional, Tuple
+from config import (
+    TEMP_DIR, AUDIO_DIR, ASSETS_DIR, SUPPORTED_FILE_TYPES, MAX_TEXT_LENGTH,
+    AVAILABLE_TONES, VOICE_NAMES_BY_LANG,
+)
+
+# Compiled once at import rather than looked up in the re cache on every call
+_UNSAFE_FILENAME_RE = re.compile(r'[^a-zA-Z0-9]')
+_SENT_SPACE_RE = re.compile(r'\.([a-zA-Z])')
+# Drops characters invalid in file names and turns spaces into underscores in one C pass
+_FILENAME_TABLE = str.maketrans({' ': '_', **dict.fromkeys('<>:"/\\|?*')})
+# Every byte except ASCII letters and digits, deleted to count [a-zA-Z0-9] in C
+_NON_ALNUM_BYTES = bytes(i for i in range(256) if not (chr(i).isascii() and chr(i).isalnum()))
+# Long inputs are judged on their opening characters only
+_ALNUM_SAMPLE_CHARS = 4096
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+_AUDIO_SUFFIXES = ('.mp3', '.wav', '.ogg', '.m4a', '.flac')
+
+
+# Set once the app directories exist, so Streamlit reruns skip the makedirs calls
+_DIRS_READY = False
 
 
 def setup_directories():
     """Create necessary directories if they don't exist."""
-    os.makedirs(TEMP_DIR, exist_ok=True)
-    os.makedirs(AUDIO_DIR, exist_ok=True)
-    os.makedirs(ASSETS_DIR, exist_ok=True)
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    
+    for directory in (TEMP_DIR, AUDIO_DIR, ASSETS_DIR):
+        os.makedirs(directory, exist_ok=True)
+    _DIRS_READY = True
 
 
+@st.cache_data(max_entries=32)
 def validate_text_input(text: str) -> tuple:
     """
     Validate text input for length and content.
@@ -26,21 +51,64 @@ def validate_text_input(text: str) -> tuple:
     Returns:
         tuple: (is_valid, error_message)
     """
-    if not text.strip():
-        return False, "Please enter some text to convert."
-    
     if len(text) > MAX_TEXT_LENGTH:
         return False, f"Text is too long. Maximum {MAX_TEXT_LENGTH} characters allowed."
     
+    # isspace() answers "blank?" without building a stripped copy
+    if not text or text.isspace():
+        return False, "Please enter some text to convert."
+    
     # Check if text contains mostly non-alphanumeric characters
-    alphanumeric_chars = len(re.findall(r'[a-zA-Z0-9]', text))
-    if alphanumeric_chars < len(text) * 0.1:  # Less than 10% alphanumeric
+    sample = text[:_ALNUM_SAMPLE_CHARS]
+    alphanumeric_chars = len(sample.encode('ascii', 'ignore').translate(None, _NON_ALNUM_BYTES))
+    if alphanumeric_chars * 10 < len(sample):  # Less than 10% alphanumeric
         return False, "Text doesn't contain enough readable content."
     
     return True, ""
 
 
-def process_uploaded_file(uploaded_file) -> Optional[str]:
+def _read_bytes(uploaded_file) -> bytes:
+    """Read the raw contents of a Streamlit uploaded file."""
+    return uploaded_file.getvalue()
+
+
+@st.cache_data(max_entries=16)
+def _parse_bytes(data: bytes, name: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Decode and validate uploaded file contents.
+    
+    Cached on the file bytes, so reruns with the same upload skip decoding
+    and validation.
+    
+    Args:
+        data: Raw file contents
+        name: Original file name
+        
+    Returns:
+        Tuple of (success, content, error_message)
+    """
+    if os.path.splitext(name)[1].lower() not in SUPPORTED_FILE_TYPES:
+        return False, None, "Unsupported file type. Please upload a text file (.txt)."
+    
+    # UTF-8 uses at most 4 bytes per character, so larger uploads are over the
+    # character limit whatever they contain; reject them without a decoded copy
+    if len(data) > 4 * MAX_TEXT_LENGTH:
+        return False, None, f"Text is too long. Maximum {MAX_TEXT_LENGTH} characters allowed."
+    
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return False, None, "Unable to read file. Please ensure it's a valid UTF-8 text file."
+    
+    # Validate the extracted text
+    is_valid, error_msg = validate_text_input(text)
+    if not is_valid:
+        return False, None, error_msg
+    
+    return True, text, None
+
+
+def process_uploaded_file(uploaded_file) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Process uploaded file and extract text content.
     
@@ -48,26 +116,26 @@ def process_uploaded_file(uploaded_file) -> Optional[str]:
         uploaded_file: Streamlit uploaded file object
         
     Returns:
-        Extracted text or None if failed
+        Tuple of (success, content, error_message)
     """
     try:
-        if uploaded_file.type == "text/plain":
-            text = uploaded_file.getvalue().decode("utf-8")
-            
-            # Validate the extracted text
-            is_valid, error_msg = validate_text_input(text)
-            if not is_valid:
-                st.error(error_msg)
-                return None
-                
-            return text
-        else:
-            st.error(f"Unsupported file type. Please upload a text file (.txt).")
-            return None
-            
+        return _parse_bytes(_read_bytes(uploaded_file), uploaded_file.name)
     except Exception as e:
-        st.error(f"Error processing file: {str(e)}")
-        return None
+        return False, None, f"Error processing file: {str(e)}"
+
+
+@functools.lru_cache(maxsize=128)
+def _safe_filename_part(value: str) -> str:
+    """Strip everything but letters and digits; tones and voices come from a small fixed set."""
+    return _UNSAFE_FILENAME_RE.sub('', value)
+
+
+# Filename-safe forms of every tone and voice the UI offers, so generate_filename
+# normally needs one dict probe per part
+_SAFE_NAME_PARTS = {
+    name: _UNSAFE_FILENAME_RE.sub('', name)
+    for name in (*AVAILABLE_TONES, *(voice for voices in VOICE_NAMES_BY_LANG.values() for voice in voices))
+}
 
 
 def generate_filename(prefix: str, tone: str, voice: str, extension: str = ".mp3") -> str:
@@ -84,13 +152,14 @@ def generate_filename(prefix: str, tone: str, voice: str, extension: str = ".mp3
         Generated filename
     """
     timestamp = int(time.time())
-    short_id = str(uuid.uuid4())[:8]
-    safe_tone = re.sub(r'[^a-zA-Z0-9]', '', tone)
-    safe_voice = re.sub(r'[^a-zA-Z0-9]', '', voice)
+    short_id = os.urandom(4).hex()
+    safe_tone = _SAFE_NAME_PARTS.get(tone) or _safe_filename_part(tone)
+    safe_voice = _SAFE_NAME_PARTS.get(voice) or _safe_filename_part(voice)
     
     return f"{prefix}_{safe_tone}_{safe_voice}_{timestamp}_{short_id}{extension}"
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def clean_text_for_display(text: str, max_length: int = 1000) -> str:
     """
     Clean and format text for display in the UI.
@@ -102,11 +171,11 @@ def clean_text_for_display(text: str, max_length: int = 1000) -> str:
     Returns:
         Cleaned text
     """
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text.strip())
+    # Remove excessive whitespace; split() collapses the same Unicode whitespace as \s+
+    text = ' '.join(text.split())
     
     # Ensure proper sentence spacing
-    text = re.sub(r'\.([a-zA-Z])', r'. \1', text)
+    text = _SENT_SPACE_RE.sub(r'. \1', text)
     
     # Truncate if too long
     if len(text) > max_length:
@@ -126,13 +195,15 @@ def truncate_text(text: str, max_words: int = 100) -> str:
     Returns:
         Truncated text
     """
-    words = text.split()
+    # Stop splitting after max_words; the remainder stays one string
+    words = text.split(None, max_words)
     if len(words) <= max_words:
         return text
     
     return ' '.join(words[:max_words]) + '...'
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def estimate_listening_time(word_count: int, words_per_minute: int = 150) -> float:
     """
     Estimate listening time based on word count.
@@ -157,11 +228,11 @@ def format_time(seconds: int) -> str:
     Returns:
         Formatted time string
     """
-    minutes = seconds // 60
-    seconds = seconds % 60
-    return f"{minutes:02d}:{seconds:02d}"
+    minutes, seconds = divmod(seconds, 60)
+    return "%02d:%02d" % (minutes, seconds)
 
 
+@functools.lru_cache(maxsize=256)
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename by removing invalid characters.
@@ -172,10 +243,8 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename
     """
-    # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-    # Replace spaces with underscores
-    filename = filename.replace(' ', '_')
+    # Remove invalid characters and replace spaces with underscores
+    filename = filename.translate(_FILENAME_TABLE)
     # Limit length
     if len(filename) > 100:
         filename = filename[:100]
@@ -195,13 +264,12 @@ def get_file_size(filepath: str) -> str:
     """
     try:
         size_bytes = os.path.getsize(filepath)
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
-    except:
+    except OSError:
         return "Unknown"
+    
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    unit_index = min(max(size_bytes.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit_index)):.1f} {_SIZE_UNITS[unit_index]}"
 
 
 def create_podcast_audio(audio_path: str, text: str, tone: str, voice: str) -> str:
@@ -234,8 +302,7 @@ def is_audio_file(filepath: str) -> bool:
     Returns:
         True if it's an audio file, False otherwise
     """
-    audio_extensions = {'.mp3', '.wav', '.ogg', '.m4a', '.flac'}
-    return os.path.splitext(filepath)[1].lower() in audio_extensions
+    return filepath.lower().endswith(_AUDIO_SUFFIXES)
 
 
 def get_available_audio_files() -> list:
@@ -245,12 +312,26 @@ def get_available_audio_files() -> list:
     Returns:
         List of audio file paths
     """
-    if not os.path.exists(AUDIO_DIR):
+    try:
+        dir_mtime_ns = os.stat(AUDIO_DIR).st_mtime_ns
+    except OSError:
         return []
     
-    audio_files = []
-    for filename in os.listdir(AUDIO_DIR):
-        if is_audio_file(filename):
-            audio_files.append(os.path.join(AUDIO_DIR, filename))
+    # Adding or removing a file bumps the directory mtime, so unchanged
+    # directories are answered from the cache without a rescan
+    return list(_scan_audio_files(str(AUDIO_DIR), dir_mtime_ns))
+
+
+@functools.lru_cache(maxsize=4)
+def _scan_audio_files(audio_dir: str, dir_mtime_ns: int) -> tuple:
+    """List audio files in a directory, newest first; cached per directory mtime."""
+    # scandir yields the path and stat together, instead of listdir plus a getmtime per file
+    with os.scandir(audio_dir) as entries:
+        audio_files = [
+            (entry.stat().st_mtime, entry.path)
+            for entry in entries
+            if is_audio_file(entry.name) and entry.is_file()
+        ]
     
-    return sorted(audio_files, key=os.path.getmtime, reverse=True)
\ No newline at end of file
+    audio_files.sort(key=lambda item: item[0], reverse=True)
+    return tuple(path for _, path in audio_files)
\ No newline at end of file